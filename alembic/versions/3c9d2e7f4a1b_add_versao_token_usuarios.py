@@ -0,0 +1,30 @@
+"""add versao_token to usuarios
+
+Revision ID: 3c9d2e7f4a1b
+Revises: 777b97b2a7e2
+Create Date: 2026-10-18 10:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2e7f4a1b'
+down_revision: Union[str, Sequence[str], None] = '777b97b2a7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.add_column(sa.Column('versao_token', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.drop_column('versao_token')
@@ -0,0 +1,44 @@
+"""add lookup indexes
+
+Revision ID: 9b1e4f6a2c8d
+Revises: 3c9d2e7f4a1b
+Create Date: 2026-10-18 11:02:17.530948
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4f6a2c8d'
+down_revision: Union[str, Sequence[str], None] = '3c9d2e7f4a1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.create_index('ix_usuarios_email', ['email'], unique=True)
+
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.create_index('ix_pedidos_usuario_status_id', ['usuario', 'status', 'id'], unique=False)
+        batch_op.create_index('ix_pedidos_status_id', ['status', 'id'], unique=False)
+
+    with op.batch_alter_table('itens_pedido') as batch_op:
+        batch_op.create_index('ix_itens_pedido_pedido', ['pedido'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('itens_pedido') as batch_op:
+        batch_op.drop_index('ix_itens_pedido_pedido')
+
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_index('ix_pedidos_status_id')
+        batch_op.drop_index('ix_pedidos_usuario_status_id')
+
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.drop_index('ix_usuarios_email')
@@ -0,0 +1,37 @@
+"""add item_count to pedidos
+
+Revision ID: c4d7e2a9f310
+Revises: 9b1e4f6a2c8d
+Create Date: 2026-10-18 11:40:05.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2a9f310'
+down_revision: Union[str, Sequence[str], None] = '9b1e4f6a2c8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.add_column(sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # preenche o contador e o total a partir dos itens já existentes
+    op.execute(
+        "UPDATE pedidos SET "
+        "item_count = (SELECT COUNT(*) FROM itens_pedido WHERE itens_pedido.pedido = pedidos.id), "
+        "preco = (SELECT COALESCE(SUM(preco_unitario * quantidade), 0) FROM itens_pedido WHERE itens_pedido.pedido = pedidos.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_column('item_count')
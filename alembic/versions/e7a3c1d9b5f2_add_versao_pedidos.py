@@ -0,0 +1,30 @@
+"""add versao to pedidos
+
+Revision ID: e7a3c1d9b5f2
+Revises: c4d7e2a9f310
+Create Date: 2026-10-18 19:05:42.610377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c1d9b5f2'
+down_revision: Union[str, Sequence[str], None] = 'c4d7e2a9f310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.add_column(sa.Column('versao', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_column('versao')
@@ -0,0 +1,57 @@
+"""Importa pedidos de um arquivo NDJSON (um pedido com itens por linha).
+
+    python -m app.commands.import_orders pedidos.ndjson --batch-size 1000
+
+Cada linha segue o OrderImportSchema:
+    {"id_usuario": 1, "status": "FINALIZADO", "itens": [{"quantidade": 2, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 25.0}]}
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
+
+from app.db.connection import SessionLocal, async_db
+from app.services.order_import_services import OrderImportService
+
+
+async def read_lines(path):
+    with open(path, "rb") as file:
+        for line in file:
+            yield line
+
+
+def print_progress(report):
+    print(
+        f"\r{report['lines']} linhas lidas | {report['imported']} importados | {report['failed']} com erro",
+        end="", file=sys.stderr, flush=True)
+
+
+async def run(path, batch_size, max_errors):
+    try:
+        async with SessionLocal() as session:
+            import_service = OrderImportService(
+                session, batch_size=batch_size, max_errors=max_errors, on_progress=print_progress)
+            return await import_service.import_lines(read_lines(path))
+    finally:
+        await async_db.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="arquivo NDJSON")
+    parser.add_argument("--batch-size", type=int, default=500, help="pedidos por lote/commit")
+    parser.add_argument("--max-errors", type=int, default=100, help="erros detalhados no relatório final")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.path, args.batch_size, args.max_errors))
+    print(file=sys.stderr)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
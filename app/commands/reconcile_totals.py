@@ -0,0 +1,83 @@
+"""Recalcula preco e item_count dos pedidos cujo valor armazenado divergiu dos itens.
+
+    python -m app.commands.reconcile_totals            # corrige
+    python -m app.commands.reconcile_totals --dry-run  # só conta
+
+Os pedidos corrigidos são removidos do cache de pedidos (``ORDER_CACHE_BACKEND``)
+depois do commit, para que as leituras não sirvam os totais antigos até o TTL.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
+
+from sqlalchemy import func, or_, select, update
+from app.db.connection import db
+from app.db.models import Pedido, ItensPedido
+from app.services.order_cache import order_cache
+
+
+# tolerância para diferenças de arredondamento de float
+TOLERANCIA_PRECO = 0.005
+# ids por UPDATE ... WHERE id IN (...) e por DELETE no cache
+IDS_POR_LOTE = 10_000
+
+
+def totais_reais():
+    preco_real = (
+        select(func.coalesce(func.sum(ItensPedido.preco_unitario * ItensPedido.quantidade), 0))
+        .where(ItensPedido.pedido == Pedido.id)
+        .scalar_subquery()
+    )
+    item_count_real = (
+        select(func.count(ItensPedido.id))
+        .where(ItensPedido.pedido == Pedido.id)
+        .scalar_subquery()
+    )
+    divergente = or_(
+        Pedido.preco.is_(None),
+        func.abs(Pedido.preco - preco_real) > TOLERANCIA_PRECO,
+        Pedido.item_count != item_count_real,
+    )
+    return preco_real, item_count_real, divergente
+
+
+def reconcile(dry_run: bool = False) -> int:
+    preco_real, item_count_real, divergente = totais_reais()
+    pedidos = Pedido.__table__
+    query = update(pedidos).values(preco=preco_real, item_count=item_count_real, versao=pedidos.c.versao + 1)
+    with db.begin() as connection:
+        if dry_run:
+            return connection.scalar(select(func.count(Pedido.id)).where(divergente))
+        if db.dialect.update_returning:
+            ids = connection.scalars(query.where(divergente).returning(pedidos.c.id)).all()
+        else:
+            # sem RETURNING (MySQL): trava os divergentes e atualiza exatamente esses
+            ids = connection.scalars(select(Pedido.id).where(divergente).with_for_update()).all()
+            for start in range(0, len(ids), IDS_POR_LOTE):
+                connection.execute(query.where(pedidos.c.id.in_(ids[start:start + IDS_POR_LOTE])))
+    asyncio.run(invalidar_cache(ids))
+    return len(ids)
+
+
+async def invalidar_cache(ids):
+    for start in range(0, len(ids), IDS_POR_LOTE):
+        await order_cache.invalidate_many(ids[start:start + IDS_POR_LOTE])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="apenas conta os pedidos divergentes")
+    args = parser.parse_args()
+
+    total = reconcile(dry_run=args.dry_run)
+    if args.dry_run:
+        print(f"{total} pedido(s) com totais divergentes")
+    else:
+        print(f"{total} pedido(s) reconciliado(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Popula usuarios, pedidos e itens_pedido com dados sintéticos para testes de carga.
+
+    python -m app.commands.seed_data --users 100000 --orders 1800000          # ~10M itens
+    python -m app.commands.seed_data --users 1000 --orders 10000 --seed 7 --admins 1
+
+Os dados são acrescentados ao que já existe (ids continuam do maior id da
+tabela) e saem sempre iguais para a mesma ``--seed``. A distribuição imita
+produção: uma fração pequena de usuários "pesados" concentra boa parte dos
+pedidos, os status seguem ``--status-mix`` e cada pedido tem de
+``--items-min`` a ``--items-max`` itens, com pedidos pequenos mais comuns.
+Todos os usuários recebem a senha ``--password`` (hash calculado uma vez).
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
+
+from sqlalchemy import func, insert, select
+from app.config import parse_key_values
+from app.db.connection import db
+from app.db.models import Usuario, Pedido, ItensPedido
+
+
+SABORES = (
+    "Calabresa", "Mussarela", "Margherita", "Portuguesa", "Frango com Catupiry",
+    "Quatro Queijos", "Pepperoni", "Napolitana", "Chocolate",
+)
+# (tamanho, preço unitário)
+TAMANHOS = (("Pequeno", 25.0), ("Médio", 35.5), ("Grande", 45.0), ("Família", 59.9))
+QUANTIDADES = (1, 1, 1, 1, 2, 2, 3)
+STATUS_MIX = {"FINALIZADO": 0.7, "PENDENTE": 0.2, "CANCELADO": 0.1}
+
+
+def _next_id(connection, column) -> int:
+    return connection.scalar(select(func.coalesce(func.max(column), 0))) + 1
+
+
+def seed_users(engine, total: int, senha_hash: str, admins: int = 0, email_domain: str = "seed.local",
+               batch_size: int = 50_000, on_progress=None) -> int:
+    """Insere ``total`` usuários (os ``admins`` primeiros como admin); e-mail é ``user<id>@<email_domain>``."""
+    with engine.connect() as connection:
+        first_id = _next_id(connection, Usuario.id)
+    for start in range(0, total, batch_size):
+        ids = range(first_id + start, first_id + min(start + batch_size, total))
+        with engine.begin() as connection:
+            connection.execute(insert(Usuario.__table__), [
+                {
+                    "id": user_id, "nome": f"user{user_id}", "email": f"user{user_id}@{email_domain}",
+                    "senha": senha_hash, "ativo": True, "admin": user_id - first_id < admins,
+                }
+                for user_id in ids
+            ])
+        if on_progress:
+            on_progress("usuarios", ids.stop - first_id, total)
+    return total
+
+
+def seed_orders(engine, total: int, rng: random.Random, status_mix: dict = STATUS_MIX,
+                items_min: int = 1, items_max: int = 20, heavy_fraction: float = 0.01,
+                heavy_share: float = 0.3, batch_size: int = 20_000, on_progress=None) -> tuple[int, int]:
+    """Insere ``total`` pedidos com itens para os usuários existentes; devolve (pedidos, itens)."""
+    if not total:
+        return 0, 0
+    with engine.connect() as connection:
+        user_ids = connection.scalars(select(Usuario.id).order_by(Usuario.id)).all()
+        first_order_id = _next_id(connection, Pedido.id)
+    if not user_ids:
+        raise ValueError("Nenhum usuário cadastrado; rode com --users antes de gerar pedidos")
+    heavy_ids = user_ids[:max(math.ceil(len(user_ids) * heavy_fraction), 1)]
+
+    statuses, status_weights = zip(*status_mix.items())
+    status_cum = list(itertools.accumulate(status_weights))
+    # 1/k: pedidos pequenos são os mais comuns, mas a cauda chega a items_max
+    item_counts = range(items_min, items_max + 1)
+    item_cum = list(itertools.accumulate(1 / count for count in item_counts))
+
+    items_total = 0
+    for start in range(0, total, batch_size):
+        size = min(batch_size, total - start)
+        order_id = first_order_id + start
+        counts = rng.choices(item_counts, cum_weights=item_cum, k=size)
+        order_statuses = rng.choices(statuses, cum_weights=status_cum, k=size)
+        n_items = sum(counts)
+        sabores = rng.choices(SABORES, k=n_items)
+        tamanhos = rng.choices(TAMANHOS, k=n_items)
+        quantidades = rng.choices(QUANTIDADES, k=n_items)
+
+        orders, items, position = [], [], 0
+        for count, status in zip(counts, order_statuses):
+            owners = heavy_ids if rng.random() < heavy_share else user_ids
+            preco = 0.0
+            for index in range(position, position + count):
+                tamanho, preco_unitario = tamanhos[index]
+                preco += preco_unitario * quantidades[index]
+                items.append({
+                    "quantidade": quantidades[index], "sabor": sabores[index], "tamanho": tamanho,
+                    "preco_unitario": preco_unitario, "pedido": order_id,
+                })
+            position += count
+            orders.append({
+                "id": order_id, "usuario": owners[rng.randrange(len(owners))], "status": status,
+                "preco": round(preco, 2), "item_count": count, "versao": 1,
+            })
+            order_id += 1
+
+        with engine.begin() as connection:
+            connection.execute(insert(Pedido.__table__), orders)
+            connection.execute(insert(ItensPedido.__table__), items)
+        items_total += n_items
+        if on_progress:
+            on_progress("pedidos", start + size, total)
+    return total, items_total
+
+
+def print_progress(table, done, total):
+    print(f"\r{table}: {done}/{total}", end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=0, help="usuários a criar")
+    parser.add_argument("--orders", type=int, default=0, help="pedidos a criar (com itens)")
+    parser.add_argument("--seed", type=int, default=42, help="semente do gerador (mesma semente, mesmos dados)")
+    parser.add_argument("--admins", type=int, default=0, help="quantos dos novos usuários são admin")
+    parser.add_argument("--password", default="123", help="senha de todos os usuários criados")
+    parser.add_argument("--email-domain", default="seed.local")
+    parser.add_argument("--status-mix", type=parse_key_values, default=STATUS_MIX,
+                        help="pesos dos status, ex.: FINALIZADO=0.7,PENDENTE=0.2,CANCELADO=0.1")
+    parser.add_argument("--items-min", type=int, default=1)
+    parser.add_argument("--items-max", type=int, default=20)
+    parser.add_argument("--heavy-fraction", type=float, default=0.01, help="fração de usuários pesados")
+    parser.add_argument("--heavy-share", type=float, default=0.3, help="fração dos pedidos feitos por eles")
+    parser.add_argument("--batch-size", type=int, default=20_000, help="pedidos (ou 50k usuários) por transação")
+    args = parser.parse_args()
+
+    from passlib.context import CryptContext
+
+    start = time.perf_counter()
+    rng = random.Random(args.seed)
+    senha_hash = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(args.password)
+    try:
+        users = seed_users(db, args.users, senha_hash, admins=args.admins, email_domain=args.email_domain,
+                           on_progress=print_progress)
+        orders, items = seed_orders(
+            db, args.orders, rng, status_mix=args.status_mix, items_min=args.items_min, items_max=args.items_max,
+            heavy_fraction=args.heavy_fraction, heavy_share=args.heavy_share, batch_size=args.batch_size,
+            on_progress=print_progress)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps({
+        "usuarios": users, "pedidos": orders, "itens": items,
+        "segundos": round(time.perf_counter() - start, 1),
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
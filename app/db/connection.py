@@ -1,5 +1,39 @@
 from sqlalchemy import create_engine
-from app.config import DATABASE_URL
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    METRICS_ENABLED)
+from app.db.pool import InstrumentedPool
+from app.db.query_counter import install_query_counter
+from app.services.metrics import install_sql_metrics
+
+
+def _pool_options(url: str) -> dict:
+    # SQLite em memória usa StaticPool, que não aceita opções de tamanho
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
 
 
 db = create_engine(DATABASE_URL)
+async_db = create_async_engine(ASYNC_DATABASE_URL, **_pool_options(ASYNC_DATABASE_URL))
+install_query_counter(async_db.sync_engine)
+if METRICS_ENABLED:
+    install_sql_metrics(async_db.sync_engine)
+
+SessionLocal = async_sessionmaker(bind=async_db, expire_on_commit=False)
@@ -1,15 +1,19 @@
 from typing import Optional
-from sqlalchemy import Column, String, Integer, Boolean, Float, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.ext.asyncio import AsyncAttrs
 # from sqlalchemy_utils.types import ChoiceType
 
 
 
 
-Base = declarative_base()
+Base = declarative_base(cls=AsyncAttrs)
 
 class Usuario(Base):
     __tablename__ = "usuarios"
+    __table_args__ = (
+        Index("ix_usuarios_email", "email", unique=True),
+    )
     
     id    = Column("id", Integer, primary_key=True, autoincrement=True)
     nome  = Column("nome", String(100))
@@ -17,6 +21,7 @@ class Usuario(Base):
     senha = Column("senha", String(300))
     ativo = Column("ativo", Boolean)
     admin = Column("admin", Boolean, default=False)
+    versao_token = Column("versao_token", Integer, nullable=False, default=0, server_default="0")
 
     def __init__(self, nome: str, email: str, senha: str, ativo: Optional[bool] = True, admin: Optional[bool] = False):
         self.nome = nome
@@ -28,6 +33,10 @@ class Usuario(Base):
 
 class Pedido(Base):
     __tablename__ = "pedidos"
+    __table_args__ = (
+        Index("ix_pedidos_usuario_status_id", "usuario", "status", "id"),
+        Index("ix_pedidos_status_id", "status", "id"),
+    )
     
     # STATUS_PEDIDOS = (
     #     ("PENDENTE", "PENDENTE"),
@@ -39,18 +48,22 @@ class Pedido(Base):
     status = Column("status", String(20))
     id_usuario = Column("usuario", ForeignKey("usuarios.id"))
     preco = Column("preco", Float)
+    item_count = Column("item_count", Integer, nullable=False, default=0, server_default="0")
+    # incrementada por todo UPDATE do pedido ou dos seus itens (ETag)
+    versao = Column("versao", Integer, nullable=False, default=1, server_default="1")
     itens = relationship("ItensPedido", cascade="all, delete")
     
     def __init__(self, usuario: int, status: str = "PENDENTE", preco: float = 0):
         self.id_usuario = usuario
         self.preco = preco
         self.status = status
-    
-    def calcular_preco(self):
-        self.preco = sum(item.preco_unitario * item.quantidade for item in self.itens)
+        self.item_count = 0
         
 class ItensPedido(Base):
     __tablename__ = "itens_pedido"
+    __table_args__ = (
+        Index("ix_itens_pedido_pedido", "pedido"),
+    )
     
     id = Column("id", Integer, primary_key=True, autoincrement=True)
     quantidade = Column("quantidade", Integer)
@@ -0,0 +1,70 @@
+import threading
+from time import perf_counter
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    """Contadores de checkout acumulados desde o início do processo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.checkout_time_total = 0.0
+        self.checkout_time_max = 0.0
+
+    def record(self, elapsed: float, waited: bool, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            if waited:
+                self.waits += 1
+            self.checkout_time_total += elapsed
+            self.checkout_time_max = max(self.checkout_time_max, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_ms_avg": round(self.checkout_time_total / attempts * 1000, 3) if attempts else 0.0,
+                "checkout_ms_max": round(self.checkout_time_max * 1000, 3),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede a latência e as esperas de cada checkout."""
+
+    # mantém os logs do pool sob o logger do SQLAlchemy (nível WARN por padrão)
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+    def connect(self):
+        waited = self.checkedin() == 0 and self._max_overflow > -1 and self._overflow >= self._max_overflow
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.record(perf_counter() - start, waited, timed_out=True)
+            raise
+        pool_stats.record(perf_counter() - start, waited)
+        return connection
+
+
+def pool_status(pool) -> dict:
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    } if isinstance(pool, InstrumentedPool) else {}
+    status.update(pool_stats.snapshot())
+    return status
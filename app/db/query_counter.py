@@ -0,0 +1,122 @@
+import logging
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Optional
+from sqlalchemy import event
+from app.config import SLOW_QUERY_MS
+from app.services.request_context import current_request
+
+
+logger = logging.getLogger("my_app")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|:\w+|\$\d+))+\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Forma normalizada da instrução: literais e listas de parâmetros viram ``?``.
+
+    ``IN (?, ?, ?)`` e ``VALUES (...), (...)`` de qualquer tamanho caem no
+    mesmo fingerprint, para que lotes de tamanhos diferentes sejam somados.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryCounter:
+    """Conta as instruções SQL executadas enquanto está ativo, e o tempo gasto nelas.
+
+    Contadores aninhados também incrementam os externos, então um teste pode
+    envolver uma requisição inteira e afirmar o total::
+
+        with count_queries() as counter:
+            await client.get("/orders/order/1", headers=headers)
+        assert counter.count <= 2
+
+    ``fingerprints`` agrega contagem e tempo por instrução normalizada.
+    """
+
+    def __init__(self, parent: Optional["QueryCounter"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.statements: list[str] = []
+        self.fingerprints: dict[str, list] = {}
+
+    def record(self, statement: str):
+        counter = self
+        while counter is not None:
+            counter.count += 1
+            counter.statements.append(statement)
+            counter = counter.parent
+
+    def record_duration(self, seconds: float, statement: Optional[str] = None):
+        key = fingerprint(statement) if statement is not None else None
+        counter = self
+        while counter is not None:
+            counter.duration += seconds
+            if key is not None:
+                stats = counter.fingerprints.setdefault(key, [0, 0.0])
+                stats[0] += 1
+                stats[1] += seconds
+            counter = counter.parent
+
+    def top_fingerprints(self, limit: int = 3) -> list[dict]:
+        ranked = sorted(self.fingerprints.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)
+        return [
+            {"fingerprint": key, "count": count, "ms": round(seconds * 1000, 2)}
+            for key, (count, seconds) in ranked[:limit]
+        ]
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter(parent=_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement)
+    if context is not None:
+        context._query_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    elapsed = perf_counter() - start
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record_duration(elapsed, statement)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        request = current_request()
+        logger.warning(
+            f"Slow query | {elapsed * 1000:.1f} ms | "
+            f"route={request.route if request else '-'} request_id={request.request_id if request else '-'} | "
+            f"{fingerprint(statement)}"
+        )
+
+
+def install_query_counter(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,32 +1,85 @@
-import traceback
-from sqlalchemy.orm import sessionmaker, Session
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException
 from jose import jwt, JWTError
 from app.main import SECRET_KEY, ALGORITHM, oath2_scheme
-from app.db.connection import db
+from app.config import USER_CACHE_TTL, USER_CACHE_SIZE, AUTH_STATELESS
+from app.db.connection import SessionLocal
 from app.db.models import Usuario
+from app.schemas.auth_schemas import AuthenticatedUserSchema
+from app.services.cache import TTLCache
+from app.services.request_context import timed
 
 
-def pegar_sessao():
+# usuários autenticados por id (claim "sub"), sem vínculo com sessão
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+
+async def pegar_sessao():
+    session = SessionLocal()
     try:
-        Session = sessionmaker(bind=db)
-        session = Session()
         yield session
     finally:
-        session.close()
+        await session.close()
+
+
+def usuario_das_claims(dic_info: dict) -> Optional[AuthenticatedUserSchema]:
+    # só access tokens emitidos no modo stateless trazem as claims de papel
+    if dic_info.get("typ") != "access" or "admin" not in dic_info or "ver" not in dic_info:
+        return None
+    return AuthenticatedUserSchema.model_construct(
+        id=int(dic_info["sub"]),
+        nome=None,
+        email=None,
+        ativo=dic_info.get("ativo"),
+        admin=dic_info["admin"],
+        versao_token=dic_info["ver"])
 
 
-def verify_jwt_token(token: str = Depends(oath2_scheme), session: Session=Depends(pegar_sessao)):
+async def carregar_usuario(user_id: int, session: AsyncSession) -> AuthenticatedUserSchema:
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
+    user = await session.scalar(select(Usuario).filter(Usuario.id==user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    authenticated_user = AuthenticatedUserSchema.model_validate(user)
+    user_cache.set(user_id, authenticated_user)
+    return authenticated_user
+
+
+async def autenticar_token(token: str, session: AsyncSession, stateless: bool, token_type: str = "access") -> AuthenticatedUserSchema:
     try:
-        dic_info = jwt.decode(token, SECRET_KEY, ALGORITHM)
+        with timed("jwt"):
+            dic_info = jwt.decode(token, SECRET_KEY, ALGORITHM)
+        # tokens antigos sem "typ" valem como access (e passam pelo banco); refresh exige "typ"
+        if dic_info.get("typ", "access") != token_type:
+            raise HTTPException(status_code=401, detail="Invalid token type")
         user_id = int(dic_info.get("sub"))
         
-        user = session.query(Usuario).filter(Usuario.id==user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+        user = usuario_das_claims(dic_info) if stateless else None
+        if user is None:
+            user = await carregar_usuario(user_id, session)
+            if "ver" in dic_info and dic_info["ver"] != user.versao_token:
+                raise HTTPException(status_code=401, detail="Token revoked")
+        
+        if user.ativo is False:
+            raise HTTPException(status_code=401, detail="Inactive user")
         
         return user
     
     except JWTError as e:
         print(e)
         raise HTTPException(status_code=401, detail="Invalid token")   
+
+
+async def verify_jwt_token(token: str = Depends(oath2_scheme), session: AsyncSession=Depends(pegar_sessao)):
+    return await autenticar_token(token, session, stateless=AUTH_STATELESS)
+
+
+async def verify_jwt_token_db(token: str = Depends(oath2_scheme), session: AsyncSession=Depends(pegar_sessao)):
+    # só aceita refresh tokens e sempre confere o usuário no banco (valida a versão do token)
+    return await autenticar_token(token, session, stateless=False, token_type="refresh")
@@ -1,11 +1,112 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
+import threading
 import yaml
 from pathlib import Path
+from app.config import LOG_FILE, LOG_QUEUE_SIZE
+
+
+_listener = None
+_queue_handler = None
+_direct_handlers = {}
+_lock = threading.Lock()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que nunca bloqueia quem loga: com a fila cheia o registro é descartado.
+
+    Os descartes são contados e, assim que a fila volta a ter espaço, um
+    aviso com o total descartado é enfileirado antes do próximo registro.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._pending_dropped = 0
+        self._drop_lock = threading.Lock()
+
+    def _drop(self, pending: int = 0):
+        with self._drop_lock:
+            self.dropped += 1
+            self._pending_dropped += pending + 1
+
+    def enqueue(self, record):
+        with self._drop_lock:
+            pending, self._pending_dropped = self._pending_dropped, 0
+        if pending:
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": "my_app.logging",
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"Log queue full | {pending} records dropped",
+                }))
+            except queue.Full:
+                self._drop(pending)
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._drop()
 
 
 def setup_logging():
-    config_path = Path(__file__).parent.parent / "logging.yaml"
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    """Aplica o logging.yaml uma única vez, com os handlers atrás de uma fila.
+
+    Os handlers declarados (console e arquivo rotativo) passam a rodar em
+    uma thread do ``QueueListener``; loggers e rotas só fazem ``put_nowait``
+    em uma fila limitada, sem I/O no event loop.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return
+        config_path = Path(__file__).parent.parent / "logging.yaml"
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f)
+        file_handler = config.get("handlers", {}).get("file")
+        if file_handler:
+            if LOG_FILE:
+                file_handler["filename"] = LOG_FILE
+            Path(file_handler["filename"]).parent.mkdir(parents=True, exist_ok=True)
         logging.config.dictConfig(config)
+
+        loggers = [logging.getLogger()] + [logging.getLogger(name) for name in config.get("loggers", {})]
+        handlers = []
+        for configured_logger in loggers:
+            for handler in configured_logger.handlers:
+                if handler not in handlers:
+                    handlers.append(handler)
+
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        for configured_logger in loggers:
+            _direct_handlers[configured_logger] = configured_logger.handlers
+            configured_logger.handlers = [_queue_handler]
+
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Esvazia a fila e para a thread do listener.
+
+    Os loggers voltam a escrever direto nos handlers, para que mensagens
+    emitidas depois do shutdown não se percam.
+    """
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        listener, _listener = _listener, None
+        listener.stop()
+        for configured_logger, handlers in _direct_handlers.items():
+            configured_logger.handlers = handlers
+        _direct_handlers.clear()
+
+
+def dropped_log_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 from typing import cast
 from fastapi import FastAPI
 from fastapi.security import OAuth2PasswordBearer
@@ -6,11 +7,16 @@ from fastapi_pagination import add_pagination
 from pathlib import Path
 from passlib.context import CryptContext
 from dotenv import load_dotenv
+from app.services.password_services import PasswordService
 
 
 env_path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+from app.logging_config import setup_logging, shutdown_logging
+from app.responses import ORJSONResponse
+setup_logging()
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY não está definida no .env")
@@ -30,9 +36,37 @@ try:
 except (ValueError, TypeError):
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.db.connection import async_db
+
+    yield
+    # encerra as threads do bcrypt (password_service é criado mais abaixo neste módulo)
+    password_service.shutdown()
+    # fecha o pool: conexões do aiosqlite abertas impedem o processo de sair
+    await async_db.dispose()
+    # escreve o que ainda estiver na fila de logs antes de o processo sair
+    shutdown_logging()
+
+
+# o FastAPI fixado (0.119) serializa o response_model para objetos Python e entrega à classe de resposta
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+from app.config import ACCESS_LOG_ENABLED, METRICS_ENABLED
+from app.middleware.access_log import AccessLogMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.sql_profiler import SQLProfilerMiddleware
+# add_middleware empilha de fora para dentro: o profiler fica dentro do access log e usa o mesmo contexto
+app.add_middleware(SQLProfilerMiddleware)
+if ACCESS_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+from app.config import BCRYPT_MAX_WORKERS, BCRYPT_MAX_QUEUE
+password_service = PasswordService(bcrypt_context, BCRYPT_MAX_WORKERS, BCRYPT_MAX_QUEUE)
 oath2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login-form")
 
 add_pagination(app)
@@ -0,0 +1,87 @@
+import json
+import logging
+import random
+import re
+import uuid
+from time import perf_counter
+from app.config import ACCESS_LOG_SAMPLE_RATE, ACCESS_LOG_ROUTE_SAMPLE_RATES, ACCESS_LOG_SLOW_MS
+from app.db.query_counter import count_queries
+from app.services.request_context import RequestContext, set_current_request, reset_current_request
+
+
+logger = logging.getLogger("my_app")
+
+# aceita o X-Request-ID do proxy só se for curto e sem caracteres de controle
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+
+class AccessLogMiddleware:
+    """Middleware ASGI puro: request id, latência total e tempo em DB, JWT e bcrypt.
+
+    Emite uma linha JSON por requisição no logger ``my_app``. A amostragem
+    vale por rota (``route_rates``, chave "MÉTODO /caminho/{param}") com
+    ``sample_rate`` como padrão; erros 5xx e requisições acima de
+    ``slow_ms`` são sempre registrados.
+    """
+
+    def __init__(self, app, sample_rate: float = ACCESS_LOG_SAMPLE_RATE,
+                 route_rates: dict = ACCESS_LOG_ROUTE_SAMPLE_RATES, slow_ms: float = ACCESS_LOG_SLOW_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.route_rates = route_rates
+        self.slow_ms = slow_ms
+
+    def _request_id(self, scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_RE.match(candidate):
+                    return candidate
+                break
+        return uuid.uuid4().hex
+
+    def _should_log(self, route: str, status: int, duration_ms: float) -> bool:
+        if status >= 500 or duration_ms >= self.slow_ms:
+            return True
+        rate = self.route_rates.get(route, self.sample_rate)
+        return rate >= 1 or random.random() < rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(request_id=self._request_id(scope), scope=scope)
+        response = {"status": 500}
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", context.request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = set_current_request(context)
+        start = perf_counter()
+        try:
+            with count_queries() as queries:
+                await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (perf_counter() - start) * 1000
+            reset_current_request(token)
+            route = context.route
+            if self._should_log(route, response["status"], duration_ms):
+                logger.info(json.dumps({
+                    "type": "access",
+                    "request_id": context.request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route,
+                    "status": response["status"],
+                    "duration_ms": round(duration_ms, 2),
+                    "db_queries": queries.count,
+                    "db_ms": round(queries.duration * 1000, 2),
+                    "jwt_ms": round(context.timings.get("jwt", 0.0) * 1000, 2),
+                    "bcrypt_ms": round(context.timings.get("bcrypt", 0.0) * 1000, 2),
+                }))
@@ -0,0 +1,34 @@
+from time import perf_counter
+from app.services.metrics import http_requests_total, http_request_duration_seconds
+
+
+class MetricsMiddleware:
+    """Middleware ASGI puro: contagem por status e histograma de latência por rota.
+
+    O rótulo é o template da rota ("/orders/order/{order_id}"), nunca o
+    caminho bruto, para manter a cardinalidade fixa.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = {"status": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "<unmatched>"
+            http_request_duration_seconds.observe(perf_counter() - start, scope["method"], path)
+            http_requests_total.inc(scope["method"], path, str(response["status"]))
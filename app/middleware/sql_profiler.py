@@ -0,0 +1,56 @@
+import json
+import logging
+import uuid
+from app.config import DEBUG, QUERY_BUDGETS
+from app.db.query_counter import count_queries
+from app.services.request_context import RequestContext, current_request, set_current_request, reset_current_request
+
+
+logger = logging.getLogger("my_app")
+
+
+class SQLProfilerMiddleware:
+    """Middleware ASGI puro: consultas SQL por requisição e orçamento por rota.
+
+    Quando a rota passa do orçamento (``budgets``, chave "MÉTODO /template")
+    registra um aviso com os fingerprints mais frequentes. Com ``debug``
+    ligado, devolve ``X-DB-Queries`` e ``X-DB-Time`` (ms) na resposta.
+    """
+
+    def __init__(self, app, budgets: dict = QUERY_BUDGETS, debug: bool = DEBUG):
+        self.app = app
+        self.budgets = budgets
+        self.debug = debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # reaproveita o contexto do access log; sem ele, cria um próprio
+        context = current_request()
+        token = None
+        if context is None:
+            context = RequestContext(request_id=uuid.uuid4().hex, scope=scope)
+            token = set_current_request(context)
+
+        with count_queries() as queries:
+            async def send_with_db_headers(message):
+                if self.debug and message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-queries", str(queries.count).encode()),
+                        (b"x-db-time", f"{queries.duration * 1000:.2f}".encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_db_headers)
+            finally:
+                if token is not None:
+                    reset_current_request(token)
+                budget = self.budgets.get(context.route)
+                if budget is not None and queries.count > budget:
+                    logger.warning(
+                        f"Query budget exceeded | {context.route} | {queries.count} queries (budget {budget}) | "
+                        f"request_id={context.request_id} | top={json.dumps(queries.top_fingerprints())}"
+                    )
@@ -0,0 +1,10 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """Resposta padrão da aplicação: o mesmo JSONResponse, serializado com orjson."""
+
+    def render(self, content) -> bytes:
+        # chaves não-str (ex.: quoted_name do SQLAlchemy) são convertidas em vez de rejeitadas
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
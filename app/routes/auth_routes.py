@@ -6,43 +6,48 @@ from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi_pagination import Params, Page, create_page
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.main import (
-    bcrypt_context, 
+    password_service, 
     SECRET_KEY, 
     ALGORITHM, 
     ACCESS_TOKEN_EXPIRE_MINUTES)
-from app.dependencies import pegar_sessao, verify_jwt_token
-from app.logging_config import setup_logging
-from app.schemas.auth_schemas import UserSchema, LoginSchema
+from app.config import AUTH_STATELESS
+from app.dependencies import pegar_sessao, verify_jwt_token, verify_jwt_token_db, user_cache
+from app.schemas.auth_schemas import UserSchema, LoginSchema, AuthenticatedUserSchema
 from app.db.models import Usuario
 from app.services.helper import AuthorizationService
+from app.services.password_services import PasswordQueueFull
 
-setup_logging()
 logger = logging.getLogger("my_app")
 
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-def criar_token(id_usuario, token_duration=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)):
+def criar_token(usuario, token_duration=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES), token_type="access"):
     try:
         expiration_data = datetime.now(timezone.utc) + token_duration
-        dic_info = { "sub": str(id_usuario), "exp": expiration_data }
+        dic_info = { "sub": str(usuario.id), "exp": expiration_data, "ver": usuario.versao_token or 0, "typ": token_type }
+        # o refresh token só serve para o /auth/refresh, que consulta o banco: não leva papéis
+        if AUTH_STATELESS and token_type == "access":
+            dic_info["admin"] = bool(usuario.admin)
+            dic_info["ativo"] = usuario.ativo
         encoded_jwt = jwt.encode(dic_info, SECRET_KEY, ALGORITHM)
         
-        logger.info(f"Token created for user {id_usuario} | Expires at {expiration_data.isoformat()}")    
+        logger.info(f"Token created for user {usuario.id} | Expires at {expiration_data.isoformat()}")    
         return encoded_jwt
     except Exception as e:
         logger.error(f"Token creation error: {traceback.format_exception(type(e), e, e.__traceback__)}")
         raise e
 
-def autenticar_usuario(email: str, senha: str, session: Session):
-    usuario = session.query(Usuario).filter_by(email=email).first()
+async def autenticar_usuario(email: str, senha: str, session: AsyncSession):
+    usuario = await session.scalar(select(Usuario).filter_by(email=email))
     
     if not usuario:
         return False
-    elif not bcrypt_context.verify(senha, cast(str, usuario.senha)):
+    elif not await password_service.verify(senha, cast(str, usuario.senha)):
         return False
     
     return usuario
@@ -110,7 +115,7 @@ def autenticar_usuario(email: str, senha: str, session: Session):
         }
     }
 )
-async def home(session: Session=Depends(pegar_sessao), user: Usuario=Depends(verify_jwt_token), params: Params = Depends()):
+async def home(session: AsyncSession=Depends(pegar_sessao), user: AuthenticatedUserSchema=Depends(verify_jwt_token), params: Params = Depends()):
     try:
         
         authorization_service = AuthorizationService()
@@ -120,7 +125,15 @@ async def home(session: Session=Depends(pegar_sessao), user: Usuario=Depends(ver
             logger.warning(f"GET users | 403 Forbidden | User {user.id} is not admin")
             raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
         
-        users = session.query(Usuario).all()
+        total = await session.scalar(select(func.count(Usuario.id)))
+        
+        offset = (params.page - 1) * params.size
+        users = await session.execute(
+            select(Usuario.id, Usuario.nome, Usuario.email)
+            .order_by(Usuario.id)
+            .offset(offset)
+            .limit(params.size)
+        )
         logger.info("GET users | 200 OK")
         
         items = [
@@ -131,10 +144,10 @@ async def home(session: Session=Depends(pegar_sessao), user: Usuario=Depends(ver
             } for user in users
         ]
 
-        offset = (params.page - 1) * params.size
-        paginated_items = items[offset:offset + params.size]
-        return create_page(paginated_items, total=len(items), params=params)
+        return create_page(items, total=total, params=params)
     
+    except HTTPException:
+        raise
     except JWTError as jwt_error:
         logger.error(f"GET users | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
@@ -192,9 +205,9 @@ async def home(session: Session=Depends(pegar_sessao), user: Usuario=Depends(ver
         }
     }
 )
-async def user(user: UserSchema, session: Session=Depends(pegar_sessao), is_user_admin: Usuario=Depends(verify_jwt_token)):
+async def user(user: UserSchema, session: AsyncSession=Depends(pegar_sessao), is_user_admin: AuthenticatedUserSchema=Depends(verify_jwt_token)):
     try:
-        usuario = session.query(Usuario).filter_by(email=user.email).first()
+        usuario = await session.scalar(select(Usuario).filter_by(email=user.email))
         
         authorization_service = AuthorizationService()
         
@@ -207,7 +220,7 @@ async def user(user: UserSchema, session: Session=Depends(pegar_sessao), is_user
             raise HTTPException(status_code=400, detail="User already exists.")
         
         else:
-            senha_criptografada = bcrypt_context.hash(user.senha)
+            senha_criptografada = await password_service.hash(user.senha)
             
             new_user = Usuario(user.nome, user.email, senha_criptografada, user.ativo, user.admin)
             ativo = user.ativo if user.ativo is not None else True
@@ -215,16 +228,99 @@ async def user(user: UserSchema, session: Session=Depends(pegar_sessao), is_user
             new_user = Usuario(user.nome, user.email, senha_criptografada, ativo, admin)
 
             session.add(new_user)
-            session.commit()
+            await session.commit()
+            user_cache.invalidate(new_user.id)
             logger.info(f"POST user {user.email} | 200 OK")
             return {"mensagem": f"User created successfully {user.email}"}
 
+    except PasswordQueueFull:
+        logger.warning(f"POST user {user.email} | 503 Password queue full")
+        raise HTTPException(status_code=503, detail="Server busy, try again later.", headers={"Retry-After": "1"})
     except JWTError as jwt_error:
         logger.error(f"POST user {user.email} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
     except Exception as e:
         logger.error(f"POST user {user.email} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@auth_router.post(
+    path="/user/{user_id}/revoke",
+    summary="Revoke user tokens",
+    description="Bump the user's token version so every issued token stops working and the user must log in again",
+    status_code=200,
+    response_model=dict,
+    responses={
+        200: {
+            "description": "Tokens revoked",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Tokens revoked for user 1",
+                        "versao_token": 3
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "User not found",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "User not found."
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Internal server error."
+                    }
+                }
+            },
+        }
+    }
+)
+async def revoke_tokens(user_id: int, session: AsyncSession=Depends(pegar_sessao), user: AuthenticatedUserSchema=Depends(verify_jwt_token)):
+    try:
+        authorization_service = AuthorizationService()
+        
+        if not authorization_service.is_admin(user):
+            logger.warning(f"POST revoke {user_id} | 403 Forbidden | User {user.id} is not admin")
+            raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+        
+        result = await session.execute(
+            update(Usuario).where(Usuario.id == user_id).values(versao_token=Usuario.versao_token + 1)
+        )
+        if not result.rowcount:
+            logger.warning(f"POST revoke {user_id} | 404 Not Found")
+            raise HTTPException(status_code=404, detail="User not found.")
+        
+        versao_token = await session.scalar(select(Usuario.versao_token).where(Usuario.id == user_id))
+        await session.commit()
+        user_cache.invalidate(user_id)
+        logger.info(f"POST revoke {user_id} | 200 OK")
+        return {"message": f"Tokens revoked for user {user_id}", "versao_token": versao_token}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"POST revoke {user_id} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -279,15 +375,15 @@ async def user(user: UserSchema, session: Session=Depends(pegar_sessao), is_user
         }
     }
 )
-async def login(login_schema: LoginSchema, session: Session=Depends(pegar_sessao)):
+async def login(login_schema: LoginSchema, session: AsyncSession=Depends(pegar_sessao)):
     try:
-        usuario = autenticar_usuario(login_schema.email, login_schema.senha, session)
+        usuario = await autenticar_usuario(login_schema.email, login_schema.senha, session)
         
         if not usuario:
             raise HTTPException(status_code=404, detail="User not found or incorrect password.")
         else:
-            access_token = criar_token(usuario.id)
-            refresh_token = criar_token(usuario.id, token_duration=timedelta(days=7))
+            access_token = criar_token(usuario)
+            refresh_token = criar_token(usuario, token_duration=timedelta(days=7), token_type="refresh")
             
             logger.info(f"POST login {login_schema.email} | 200 OK ")
             return {
@@ -295,6 +391,9 @@ async def login(login_schema: LoginSchema, session: Session=Depends(pegar_sessao
                 "refresh_token": refresh_token,
                 "token_type": "bearer"
             }
+    except PasswordQueueFull:
+        logger.warning(f"POST login {login_schema.email} | 503 Password queue full")
+        raise HTTPException(status_code=503, detail="Server busy, try again later.", headers={"Retry-After": "1"})
     except JWTError as jwt_error:
         logger.error(f"POST login {login_schema.email} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
@@ -353,20 +452,23 @@ async def login(login_schema: LoginSchema, session: Session=Depends(pegar_sessao
         }
     }
 )
-async def login_form(forms: OAuth2PasswordRequestForm = Depends(), session: Session=Depends(pegar_sessao)):
+async def login_form(forms: OAuth2PasswordRequestForm = Depends(), session: AsyncSession=Depends(pegar_sessao)):
     try:
-        usuario = autenticar_usuario(forms.username, forms.password, session)
+        usuario = await autenticar_usuario(forms.username, forms.password, session)
         
         if not usuario:
             raise HTTPException(status_code=404, detail="User not found or incorrect password.")
         else:
-            access_token = criar_token(usuario.id)
+            access_token = criar_token(usuario)
             
             logger.info(f"POST login-form {forms.username} | 200 OK ")
             return {
                 "access_token": access_token,
                 "token_type": "Bearer"
             }
+    except PasswordQueueFull:
+        logger.warning(f"POST login-form {forms.username} | 503 Password queue full")
+        raise HTTPException(status_code=503, detail="Server busy, try again later.", headers={"Retry-After": "1"})
     except JWTError as jwt_error:
         logger.error(f"POST login-form {forms.username} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
@@ -416,11 +518,11 @@ async def login_form(forms: OAuth2PasswordRequestForm = Depends(), session: Sess
         }
     }
 )
-async def refresh_token(user: Usuario=Depends(verify_jwt_token)):
+async def refresh_token(user: AuthenticatedUserSchema=Depends(verify_jwt_token_db)):
     try:
         
-        new_access_token = criar_token(user.id)
-        new_refresh_token = criar_token(user.id, token_duration=timedelta(days=7))
+        new_access_token = criar_token(user)
+        new_refresh_token = criar_token(user, token_duration=timedelta(days=7), token_type="refresh")
         logger.info(f"POST refresh token for user {user.id} | 200 OK")
 
         return {
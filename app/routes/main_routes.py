@@ -1,10 +1,19 @@
 import logging
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse
-from app.logging_config import setup_logging
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from typing import Optional
+from app.dependencies import verify_jwt_token, user_cache
+from app.services.order_cache import order_cache
+from app.services.metrics import registry
+from app.config import METRICS_ENABLED, METRICS_TOKEN
+from app.logging_config import dropped_log_records
+from app.main import password_service
+from app.db.connection import async_db
+from app.db.pool import pool_status, pool_stats
+from app.schemas.auth_schemas import AuthenticatedUserSchema
+from app.services.helper import AuthorizationService
 
 
-setup_logging()
 logger = logging.getLogger("my_app")
 
 
@@ -63,4 +72,147 @@ async def health_check():
         </body>
     </html>
     """
-    return HTMLResponse(content=html_content, status_code=200)
\ No newline at end of file
+    return HTMLResponse(content=html_content, status_code=200)
+
+
+@auth_router.get(
+    path="/health/pool",
+    summary="Connection pool statistics",
+    description="Returns live statistics of the database connection pool (admins only)",
+    status_code=200,
+    response_model=dict,
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "size": 10,
+                        "checked_in": 3,
+                        "checked_out": 7,
+                        "overflow": 0,
+                        "checkouts": 1520,
+                        "waits": 4,
+                        "timeouts": 0,
+                        "checkout_ms_avg": 0.212,
+                        "checkout_ms_max": 48.91
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        }
+    }
+)
+async def pool_health(user: AuthenticatedUserSchema=Depends(verify_jwt_token)):
+    if not AuthorizationService().is_admin(user):
+        logger.warning(f"GET health/pool | 403 Forbidden | User {user.id} is not admin")
+        raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+    
+    logger.info("GET health/pool | 200 OK")
+    return pool_status(async_db.pool)
+
+
+@auth_router.get(
+    path="/health/cache",
+    summary="In-process cache statistics",
+    description="Returns size and hit/miss counters of the in-process caches (admins only)",
+    status_code=200,
+    response_model=dict,
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "users": {
+                            "size": 120,
+                            "maxsize": 10000,
+                            "ttl": 30.0,
+                            "hits": 9512,
+                            "misses": 488,
+                            "hit_ratio": 0.9512
+                        },
+                        "orders": {
+                            "backend": "memory",
+                            "size": 340,
+                            "maxsize": 10000,
+                            "ttl": 10.0,
+                            "hits": 20411,
+                            "misses": 1893,
+                            "hit_ratio": 0.9151
+                        }
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        }
+    }
+)
+async def cache_health(user: AuthenticatedUserSchema=Depends(verify_jwt_token)):
+    if not AuthorizationService().is_admin(user):
+        logger.warning(f"GET health/cache | 403 Forbidden | User {user.id} is not admin")
+        raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+    
+    logger.info("GET health/cache | 200 OK")
+    return {"users": user_cache.stats(), "orders": order_cache.stats()}
+
+
+# lidas só na coleta: nenhum custo no caminho das requisições
+def _pool_gauge(key):
+    return lambda: pool_status(async_db.pool).get(key, 0)
+
+
+for _key, _doc in (
+    ("size", "Connections kept open by the pool."),
+    ("checked_out", "Connections currently checked out."),
+    ("checked_in", "Idle connections in the pool."),
+    ("overflow", "Connections open above the pool size."),
+):
+    registry.gauge_callback(f"db_pool_{_key}", _doc, _pool_gauge(_key))
+registry.counter_callback("db_pool_checkouts_total", "Successful pool checkouts.", lambda: pool_stats.snapshot()["checkouts"])
+registry.counter_callback("db_pool_waits_total", "Checkouts that had to wait for a free connection.", lambda: pool_stats.snapshot()["waits"])
+registry.counter_callback("db_pool_timeouts_total", "Checkouts that timed out.", lambda: pool_stats.snapshot()["timeouts"])
+registry.gauge_callback("db_pool_checkout_seconds_max", "Slowest pool checkout since start.", lambda: pool_stats.snapshot()["checkout_ms_max"] / 1000)
+registry.gauge_callback("bcrypt_queue_depth", "Password hash/verify calls waiting for a bcrypt thread.", lambda: password_service.queue_depth)
+registry.gauge_callback("bcrypt_in_flight", "Password hash/verify calls running or queued.", lambda: password_service.pending)
+registry.counter_callback(
+    "cache_hits_total", "Cache hits by cache.",
+    lambda: {("users",): user_cache.stats()["hits"], ("orders",): order_cache.stats()["hits"]}, ("cache",)
+)
+registry.counter_callback(
+    "cache_misses_total", "Cache misses by cache.",
+    lambda: {("users",): user_cache.stats()["misses"], ("orders",): order_cache.stats()["misses"]}, ("cache",)
+)
+registry.counter_callback("log_records_dropped_total", "Log records dropped because the log queue was full.", dropped_log_records)
+
+
+if METRICS_ENABLED:
+    @auth_router.get(
+        path="/metrics",
+        summary="Prometheus metrics",
+        description="Request, SQL, pool, bcrypt and cache metrics in the Prometheus text format",
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+    )
+    async def metrics(authorization: Optional[str] = Header(None)):
+        if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
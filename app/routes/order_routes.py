@@ -1,19 +1,24 @@
 import logging
 import traceback
 from jose import JWTError
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Literal, Optional, cast
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import pegar_sessao, verify_jwt_token
-from app.logging_config import setup_logging
-from app.schemas.order_schemas import OrderResponse, OrderSchema, ItemOrderSchema
-from app.db.models import Pedido, Usuario, ItensPedido
-from app.schemas.order_schemas import ResponseOrderShema
-from app.services.order_services import OrderService
+from app.schemas.order_schemas import OrderResponse, OrderSchema, ItemOrderSchema, CursorPage, OrderStatusBatchSchema
+from app.db.models import Pedido, ItensPedido
+from app.schemas.order_schemas import ResponseOrderShema, GetOrderResponse, FinishOrderResponse
+from app.schemas.auth_schemas import AuthenticatedUserSchema
+from app.services.order_services import OrderService, etag_matches, order_etag
+from app.services.order_import_services import OrderImportService, iter_ndjson_lines
+from app.services.order_export_services import OrderExportService
+from app.services.order_cache import order_cache
+from app.db.connection import async_db
 from app.services.helper import AuthorizationService
 
 
-setup_logging()
 logger = logging.getLogger("my_app")
 
 order_router = APIRouter(prefix="/orders", tags=["orders"], dependencies=[Depends(verify_jwt_token)])
@@ -22,23 +27,31 @@ order_router = APIRouter(prefix="/orders", tags=["orders"], dependencies=[Depend
 @order_router.get(
     path="/order",
     summary="Orders List",
-    description="Returns all available orders (optional filter by status)",
+    description="Returns all orders (optional filter by status), paginated by cursor. Admins only.",
     status_code=200,
-    response_model=List[OrderResponse],
+    response_model=CursorPage[OrderResponse],
     responses= {
         "200": {
             "description": "Successful Response",
             "content": {
                 "application/json": {
                     "example": {
-                        "id": 1,
-                        "status": "CANCELADO",
-                        "id_usuario": 1,
-                        "preco": 25.5
+                        "items": [
+                            {
+                                "id": 1,
+                                "status": "CANCELADO",
+                                "id_usuario": 1,
+                                "preco": 25.5
+                            }
+                        ],
+                        "next_cursor": "MQ"
                     }
                 }
             }
         },
+        "304": {
+            "description": "Not Modified: the page still matches the If-None-Match ETag"
+        },
         "401": {
             "description": "Unauthorized Access",
             "content": {
@@ -49,6 +62,16 @@ order_router = APIRouter(prefix="/orders", tags=["orders"], dependencies=[Depend
                 }
             }
         },
+        "403": {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        },
         "404": {
             "description": "Additional Response",
             "content": {
@@ -83,18 +106,35 @@ order_router = APIRouter(prefix="/orders", tags=["orders"], dependencies=[Depend
 )
 async def orders(
     status: Optional[Literal['PENDENTE', 'CANCELADO', 'FINALIZADO']] = None, 
-    session: Session = Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    if_none_match: Optional[str] = Header(None),
+    response: Response = None,
+    session: AsyncSession = Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     
     ):
     try:
+        authorization_service = AuthorizationService()
+        if not authorization_service.is_admin(user):
+            logger.warning(f"GET orders | 403 Forbidden | User {user.id} is not admin")
+            raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+        
         order_service = OrderService()
-        orders = order_service.get_order(status, user, session)
+        if if_none_match:
+            etag = await order_service.get_order_etag(status, session, limit, cursor)
+            if etag_matches(if_none_match, etag):
+                logger.info("GET orders | 304 Not Modified")
+                return Response(status_code=304, headers={"ETag": etag})
+        orders, next_cursor, etag = await order_service.get_order(status, session, limit, cursor)
         if not orders:
             logger.warning("GET orders | 404 No orders found")
             raise HTTPException(status_code=404, detail="No orders found")
+        response.headers["ETag"] = etag
         logger.info("GET orders | 200 OK")
-        return orders
+        return {"items": orders, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"GET orders | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
         raise HTTPException(status_code=500, detail="Internal server error.")
@@ -141,8 +181,8 @@ async def orders(
 )
 async def create_order(
     order_schema: OrderSchema, 
-    session: Session=Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     ):
     try:
         new_order = Pedido(usuario=order_schema.id_usuario)
@@ -155,7 +195,7 @@ async def create_order(
             raise HTTPException(status_code=401, detail="Not authorized to create order for another user.")
 
         session.add(new_order)
-        session.commit()
+        await session.commit()
         
         logger.info(f"POST create_order {order_schema.id_usuario} | 201 Created")
         return {"message": f"Create order: {new_order.id}"}
@@ -165,7 +205,187 @@ async def create_order(
         raise HTTPException(status_code=401, detail="Token generation error.")
     except Exception as e:
         logger.error(f"POST criar_conta {order_schema.id_usuario} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@order_router.post(
+    path="/order/import",
+    description="Import orders with embedded items from an NDJSON body (one order per line). Admins only.",
+    summary="Bulk import orders (NDJSON)",
+    status_code=200,
+    response_model=dict,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"id_usuario": 1, "status": "FINALIZADO", "itens": [{"quantidade": 2, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 25.0}]}\n'
+                }
+            }
+        }
+    },
+    responses={
+        200: {
+            "description": "Import finished (per-line errors are reported in the body)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "lines": 3,
+                        "imported": 2,
+                        "failed": 1,
+                        "errors": [
+                            {
+                                "line": 2,
+                                "errors": [
+                                    {
+                                        "type": "missing",
+                                        "loc": ["id_usuario"],
+                                        "msg": "Field required"
+                                    }
+                                ]
+                            }
+                        ],
+                        "errors_truncated": False
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Internal server error"
+                    }
+                }
+            },
+        }
+    }
+)
+async def import_orders(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=5000, description="Orders per INSERT batch / commit"),
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
+    ):
+    try:
+        authorization_service = AuthorizationService()
+        if not authorization_service.is_admin(user):
+            logger.warning(f"POST import_orders | 403 Forbidden | User {user.id} is not admin")
+            raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+        
+        def log_progress(report):
+            logger.info(f"POST import_orders | progress | {report['imported']} imported, {report['failed']} failed, {report['lines']} lines read")
+        
+        import_service = OrderImportService(session, batch_size=batch_size, on_progress=log_progress)
+        report = await import_service.import_lines(iter_ndjson_lines(request.stream()))
+        logger.info(f"POST import_orders | {report['imported']} imported, {report['failed']} failed | 200 OK")
+        return report
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"POST import_orders | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
+        await session.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@order_router.get(
+    path="/order/export",
+    description="Stream all orders as NDJSON or CSV using a server-side cursor, optionally with their items. Admins only.",
+    summary="Export orders (NDJSON/CSV)",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Orders streamed one per line (CSV: one line per item when include_items is set)",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"id": 1, "status": "PENDENTE", "id_usuario": 1, "preco": 51.0, "item_count": 1, "itens": [{"item_id": 1, "quantidade": 2, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 25.5}]}\n'
+                },
+                "text/csv": {
+                    "example": "id,status,id_usuario,preco,item_count\r\n1,PENDENTE,1,51.0,1\r\n"
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        },
+        422: {
+            "description": "Invalid data provided",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "id_from must be less than or equal to id_to"
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Internal server error"
+                    }
+                }
+            },
+        }
+    }
+)
+async def export_orders(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    include_items: bool = Query(False),
+    status: Optional[Literal['PENDENTE', 'CANCELADO', 'FINALIZADO']] = Query(None),
+    id_from: Optional[int] = Query(None, ge=1),
+    id_to: Optional[int] = Query(None, ge=1),
+    chunk_size: int = Query(1000, ge=100, le=10000, description="Rows per server-side fetch"),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
+    ):
+    try:
+        authorization_service = AuthorizationService()
+        if not authorization_service.is_admin(user):
+            logger.warning(f"GET export_orders | 403 Forbidden | User {user.id} is not admin")
+            raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+        if id_from is not None and id_to is not None and id_from > id_to:
+            logger.warning(f"GET export_orders | 422 id_from {id_from} > id_to {id_to}")
+            raise HTTPException(status_code=422, detail="id_from must be less than or equal to id_to")
+        
+        # o gerador usa conexões próprias: a sessão da requisição é fechada antes do corpo ser enviado
+        export_service = OrderExportService(
+            async_db, status=status, id_from=id_from, id_to=id_to,
+            include_items=include_items, chunk_size=chunk_size
+        )
+        media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+        logger.info(f"GET export_orders | {export_format} | 200 OK")
+        return StreamingResponse(
+            export_service.stream(export_format),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="orders.{export_format}"'}
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"GET export_orders | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -191,12 +411,22 @@ async def create_order(
                 }
             },
         },
+        409: {
+            "description": "Order is not PENDENTE",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Order 1 is FINALIZADO; cannot change it to CANCELADO."
+                    }
+                }
+            }
+        },
         401: {
             "description": "Not authorized to cancel this order",
             "content": {
                 "application/json": {
                     "example": {
-                        "detail": "Not authorized to cancel this order | Admins only."
+                        "detail": "Not authorized to change this order."
                     }
                 }
             }
@@ -225,39 +455,34 @@ async def create_order(
 )
 async def cancel_order(
     order_id: int, 
-    session: Session=Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
 ):
     try:
-        order = session.query(Pedido).filter(Pedido.id == order_id).first()
-        if not order:
-            logger.warning(f"POST cancel_order {order_id} | 404 Not Found")
-            raise HTTPException(status_code=404, detail="Order not found")
-        
-        authorization_service = AuthorizationService()
-        is_admin_or_owner: bool = authorization_service.can_access_order(user, order)
-        
-        if not is_admin_or_owner:
-            logger.warning(f"POST cancel_order {order_id} | 401 Not authorized")
-            raise HTTPException(status_code=401, detail="Not authorized to cancel this order | Admins only.")
-        
-        order.status = "CANCELADO"
-        session.commit()
+        # um único UPDATE condicionado a status PENDENTE (e ao dono, se não for admin)
+        order_service = OrderService()
+        order = await order_service.transition_order(order_id, "CANCELADO", user, session)
+        await session.commit()
+        await order_cache.invalidate(order_id)
         logger.info(f"POST cancel_order {order_id} | 200 OK")
         return {
             "message": f"Order {order_id} canceled successfully",
             "order": {
-                "id": order.id,
-                "status": order.status,
-                "price": order.preco
+                "id": order["id"],
+                "status": order["status"],
+                "price": order["preco"]
             }
         }
+    except HTTPException as http_error:
+        logger.warning(f"POST cancel_order {order_id} | {http_error.status_code} {http_error.detail}")
+        await session.rollback()
+        raise
     except JWTError as jwt_error:
         logger.error(f"POST cancel_order {order_id} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
     except Exception as e:
         logger.error(f"POST cancel_order {order_id} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -319,11 +544,11 @@ async def cancel_order(
 async def add_item_to_order(
     order_id: int,
     item_order_schema: ItemOrderSchema,
-    session: Session=Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     ):
     try:
-        order = session.query(Pedido).filter(Pedido.id == order_id).first()
+        order = await session.scalar(select(Pedido).filter(Pedido.id == order_id))
         if not order:
             logger.warning(f"POST add_item_to_order {order_id} | 404 Not Found")
             raise HTTPException(status_code=404, detail="Order not found")
@@ -344,8 +569,14 @@ async def add_item_to_order(
             pedido=order_id
         )
         session.add(item_order)
-        order.calcular_preco()
-        session.commit()
+        await session.flush()
+        
+        order_service = OrderService()
+        preco_pedido = await order_service.apply_item_delta(
+            order_id, item_order.preco_unitario * item_order.quantidade, 1, session
+        )
+        await session.commit()
+        await order_cache.invalidate(order_id)
         logger.info(f"POST add_item_to_order {order_id} | 200 OK")
         return {
             "message": f"Item added to order {order_id} successfully",
@@ -353,16 +584,125 @@ async def add_item_to_order(
                 "quantidade": item_order.quantidade,
                 "sabor": item_order.sabor,
                 "tamanho": item_order.tamanho,
-                "preco_pedido": order.preco
+                "preco_pedido": preco_pedido
             }
         }
     
+    except HTTPException:
+        raise
     except JWTError as jwt_error:
         logger.error(f"POST add_item_to_order {order_id} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
     except Exception as e:
         logger.error(f"POST add_item_to_order {order_id} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@order_router.post(
+    path="/order/add_items/{order_id}",
+    description="Add a list of items to an existing order in a single transaction",
+    summary="Add items to order in bulk",
+    status_code=200,
+    response_model=dict,
+    responses={
+        200: {
+            "description": "Items added to order successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "3 items added to order 1 successfully",
+                        "items_added": 3,
+                        "preco_pedido": 85.0
+                    }
+                }
+            },
+        },
+        401: {
+            "description": "Not authorized to add items to this order",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authorized to add items to this order."
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "Order not found",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Order not found"
+                    }
+                }
+            }
+        },
+        422: {
+            "description": "Invalid items (nothing is inserted)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": [
+                            {
+                                "type": "greater_than",
+                                "loc": ["body", 1, "preco_unitario"],
+                                "msg": "Input should be greater than 0",
+                                "input": 0,
+                                "ctx": {"gt": 0.0}
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Internal server error"
+                    }
+                }
+            },
+        }
+    }
+    )
+async def add_items_to_order(
+    order_id: int,
+    items: List[ItemOrderSchema] = Body(..., min_length=1, max_length=500),
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
+    ):
+    try:
+        order = await session.scalar(select(Pedido).filter(Pedido.id == order_id))
+        if not order:
+            logger.warning(f"POST add_items_to_order {order_id} | 404 Not Found")
+            raise HTTPException(status_code=404, detail="Order not found")
+        
+        authorization_service = AuthorizationService()
+        is_admin_or_owner: bool = authorization_service.can_access_order(user, order)
+        
+        if not is_admin_or_owner:
+            logger.warning(f"POST add_items_to_order {order_id} | 401 Not authorized")
+            raise HTTPException(status_code=401, detail="Not authorized to add items to this order.")
+        
+        order_service = OrderService()
+        preco_pedido = await order_service.add_items(order_id, items, session)
+        await session.commit()
+        await order_cache.invalidate(order_id)
+        logger.info(f"POST add_items_to_order {order_id} | {len(items)} items | 200 OK")
+        return {
+            "message": f"{len(items)} items added to order {order_id} successfully",
+            "items_added": len(items),
+            "preco_pedido": preco_pedido
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"POST add_items_to_order {order_id} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -419,16 +759,16 @@ async def add_item_to_order(
     )
 async def delete_item(
     id_item_order: int,
-    session: Session=Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     ):
     try:
-        item_order = session.query(ItensPedido).filter(ItensPedido.id == id_item_order).first()
+        item_order = await session.scalar(select(ItensPedido).filter(ItensPedido.id == id_item_order))
         if not item_order:
             logger.warning(f"POST delete_item {item_order} | 404 Not Found")
             raise HTTPException(status_code=404, detail="Order not found")
         
-        order = session.query(Pedido).filter(Pedido.id==item_order.pedido).first()
+        order = await session.scalar(select(Pedido).filter(Pedido.id==item_order.pedido))
         if not order:
             logger.warning(f"POST delete_item {id_item_order} | 404 Not Found")
             raise HTTPException(status_code=404, detail="Order not found")
@@ -440,23 +780,35 @@ async def delete_item(
             logger.warning(f"POST delete_item {id_item_order} | 401 Not authorized")
             raise HTTPException(status_code=401, detail="Not authorized to remove items to this order.")
         
-        session.delete(item_order)
-        order.calcular_preco()
+        # só desconta do pedido se este DELETE de fato removeu o item
+        result = await session.execute(delete(ItensPedido).where(ItensPedido.id == item_order.id))
+        if not result.rowcount:
+            logger.warning(f"DELETE delete_item {id_item_order} | 404 Not Found")
+            raise HTTPException(status_code=404, detail="Order not found")
         
-        session.commit()
+        order_service = OrderService()
+        order_price = await order_service.apply_item_delta(
+            order.id, -(item_order.preco_unitario * item_order.quantidade), -1, session
+        )
+        
+        await session.commit()
+        await order_cache.invalidate(order.id)
         return{
             "item_id": item_order.id,
             "message": "Item successfully deleted.",
-            "order_price": order.preco
+            "order_price": order_price
         }
     
+    except HTTPException:
+        await session.rollback()
+        raise
     except JWTError as jwt_error:
         logger.error(f"DELETE delete_item {id_item_order} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
     
     except Exception as e:
         logger.error(f"DELETE delete_item {id_item_order} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -465,6 +817,7 @@ async def delete_item(
     description="Finish an existing order",
     summary="Finish order",
     status_code=200,
+    response_model=FinishOrderResponse,
     responses={
         200: {
             "description": "Finish order successfully",
@@ -475,18 +828,31 @@ async def delete_item(
                         "order": {
                             "id": 1,
                             "status": "FINALIZADO",
-                            "preco": 50.0
+                            "id_usuario": 1,
+                            "preco": 50.0,
+                            "item_count": 2,
+                            "versao": 4
                         }
                     }
                 }
             },
         },
+        409: {
+            "description": "Order is not PENDENTE",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Order 1 is CANCELADO; cannot change it to FINALIZADO."
+                    }
+                }
+            }
+        },
         401: {
             "description": "Not authorized to finish this order",
             "content": {
                 "application/json": {
                     "example": {
-                        "detail": "Not authorized to finish this order."
+                        "detail": "Not authorized to change this order."
                     }
                 }
             },
@@ -515,37 +881,110 @@ async def delete_item(
     )
 async def finish_order(
     order_id: int,
-    session: Session=Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     ):
     try:
-        order = session.query(Pedido).filter(Pedido.id == order_id).first()
-        if not order:
-            logger.warning(f"POST finish_order {order_id} | 404 Not Found")
-            raise HTTPException(status_code=404, detail="Order not found")
-        
-        authorization_service = AuthorizationService()
-        is_admin_or_owner: bool = authorization_service.can_access_order(user, order)
-        
-        if not is_admin_or_owner:
-            logger.warning(f"POST finish_order {order_id} | 401 Not authorized")
-            raise HTTPException(status_code=401, detail="Not authorized to finish this order.")
-        
-        order.status = "FINALIZADO"
-        session.commit()
+        order_service = OrderService()
+        order = await order_service.transition_order(order_id, "FINALIZADO", user, session)
+        await session.commit()
+        await order_cache.invalidate(order_id)
         logger.info(f"POST finish_order {order_id} | 200 OK")
         
         return {
-            "message": f"Order {order.id} finalized successfully",
+            "message": f"Order {order_id} finalized successfully",
             "order": order
         }
     
+    except HTTPException as http_error:
+        logger.warning(f"POST finish_order {order_id} | {http_error.status_code} {http_error.detail}")
+        await session.rollback()
+        raise
     except JWTError as jwt_error:
         logger.error(f"POST finish_order {order_id} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
     except Exception as e:
         logger.error(f"POST finish_order {order_id} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@order_router.post(
+    path="/order/status/batch",
+    description="Cancel or finish many PENDENTE orders in a single conditional UPDATE. Admins only.",
+    summary="Batch status transition",
+    status_code=200,
+    response_model=dict,
+    responses={
+        200: {
+            "description": "Transition applied (orders not found or not PENDENTE are listed in skipped_ids)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "CANCELADO",
+                        "requested": 3,
+                        "updated": 2,
+                        "updated_ids": [1, 2],
+                        "skipped_ids": [7]
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Access forbidden: Admins only."
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Internal server error"
+                    }
+                }
+            },
+        }
+    }
+)
+async def batch_status_transition(
+    batch_schema: OrderStatusBatchSchema,
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
+    ):
+    try:
+        authorization_service = AuthorizationService()
+        if not authorization_service.is_admin(user):
+            logger.warning(f"POST batch_status_transition | 403 Forbidden | User {user.id} is not admin")
+            raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+        
+        order_ids = list(dict.fromkeys(batch_schema.ids))
+        order_service = OrderService()
+        rows = await order_service.transition_status(order_ids, batch_schema.status, session)
+        await session.commit()
+        
+        updated_ids = sorted(row["id"] for row in rows)
+        await order_cache.invalidate_many(updated_ids)
+        updated = set(updated_ids)
+        logger.info(f"POST batch_status_transition | {batch_schema.status} {len(updated_ids)}/{len(order_ids)} | 200 OK")
+        return {
+            "status": batch_schema.status,
+            "requested": len(order_ids),
+            "updated": len(updated_ids),
+            "updated_ids": updated_ids,
+            "skipped_ids": [order_id for order_id in order_ids if order_id not in updated]
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"POST batch_status_transition | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -554,6 +993,7 @@ async def finish_order(
     description="Get an existing order",
     summary="Get order",
     status_code=200,
+    response_model=GetOrderResponse,
     responses={
         200: {
             "description": "Get order successfully",
@@ -566,6 +1006,8 @@ async def finish_order(
                             "status": "PENDENTE",
                             "id_usuario": 1,
                             "preco": 50.0,
+                            "item_count": 2,
+                            "versao": 3,
                             "itens": [
                                 {
                                     "id": 1,
@@ -589,6 +1031,9 @@ async def finish_order(
                 },
             },
         },
+        304: {
+            "description": "Not Modified: the order still matches the If-None-Match ETag"
+        },
         401: {
             "description": "Not authorized to get this order",
             "content": {
@@ -623,65 +1068,80 @@ async def finish_order(
     )
 async def get_order(
     order_id: int,
-    session: Session=Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    if_none_match: Optional[str] = Header(None),
+    response: Response = None,
+    session: AsyncSession=Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     ):
     try:
         order_service = OrderService()
-        order = order_service.get_order_by_id(order_id, session)
-        
+        order = await order_service.get_cached_order(order_id, session)
         
+        # avaliada a cada leitura, inclusive quando o pedido vem do cache
         authorization_service = AuthorizationService()
-        is_admin_or_owner: bool = authorization_service.can_access_order(user, order)
+        is_admin_or_owner: bool = authorization_service.can_access_owner(user, order["id_usuario"])
         
         if not is_admin_or_owner:
             logger.warning(f"POST get_order {order_id} | 401 Not authorized")
             raise HTTPException(status_code=401, detail="Not authorized to get this order.")
 
+        etag = order_etag(order["id"], order["versao"])
+        if etag_matches(if_none_match, etag):
+            logger.info(f"POST get_order {order_id} | 304 Not Modified")
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         logger.info(f"POST get_order {order_id} | 200 OK")
 
         return {
-            "quantity": len(order.itens),
+            "quantity": order["item_count"],
             "order": order
         }
     
+    except HTTPException:
+        raise
     except JWTError as jwt_error:
         logger.error(f"POST get_order {order_id} | 401 Unauthorized | {traceback.format_exception(type(jwt_error), jwt_error, jwt_error.__traceback__)}")
         raise HTTPException(status_code=401, detail="Token generation error.")
     except Exception as e:
         logger.error(f"POST get_order {order_id} | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
 @order_router.get(
     path="/order/user/list_orders_user",
     summary="Orders List",
-    description="Returns a user's orders",
+    description="Returns a user's orders, paginated by cursor",
     status_code=200,
-    response_model=List[ResponseOrderShema],
+    response_model=CursorPage[ResponseOrderShema],
     responses= {
         "200": {
             "description": "Successful Response",
             "content": {
                 "application/json": {
-                    "example": [
-                        {
-                            "preco": 67.5,
-                            "id": 1,
-                            "status": "CANCELADO",
-                            "id_usuario": 2
-                        },
-                        {
-                            "preco": 40.6,
-                            "id": 2,
-                            "status": "PENDENTE",
-                            "id_usuario": 3
-                        }
-                    ]
+                    "example": {
+                        "items": [
+                            {
+                                "preco": 67.5,
+                                "id": 1,
+                                "status": "CANCELADO",
+                                "itens": []
+                            },
+                            {
+                                "preco": 40.6,
+                                "id": 2,
+                                "status": "PENDENTE",
+                                "itens": []
+                            }
+                        ],
+                        "next_cursor": None
+                    }
                 }
             }
         },
+        "304": {
+            "description": "Not Modified: the page still matches the If-None-Match ETag"
+        },
         "401": {
             "description": "Unauthorized Access",
             "content": {
@@ -725,16 +1185,29 @@ async def get_order(
     }
 )
 async def list_orders(
-    session: Session = Depends(pegar_sessao),
-    user: Usuario=Depends(verify_jwt_token)
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    if_none_match: Optional[str] = Header(None),
+    response: Response = None,
+    session: AsyncSession = Depends(pegar_sessao),
+    user: AuthenticatedUserSchema=Depends(verify_jwt_token)
     ):
     try:
-        orders = session.query(Pedido).filter_by(id_usuario=user.id).all()
+        order_service = OrderService()
+        if if_none_match:
+            etag = await order_service.list_orders_etag(user, session, limit, cursor)
+            if etag_matches(if_none_match, etag):
+                logger.info("GET list_orders_user | 304 Not Modified")
+                return Response(status_code=304, headers={"ETag": etag})
+        orders, next_cursor, etag = await order_service.list_orders(user, session, limit, cursor)
         if not orders:
             logger.warning("GET list_orders_user | 404 No orders found")
             raise HTTPException(status_code=404, detail="No orders found")
+        response.headers["ETag"] = etag
         logger.info(f"GET list_orders_user | 200 OK")
-        return orders
+        return {"items": orders, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"GET list_orders_user | 500 ERRO | {traceback.format_exception(type(e), e, e.__traceback__)}")
         raise HTTPException(status_code=500, detail="Internal server error.")
@@ -19,3 +19,16 @@ class LoginSchema(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class AuthenticatedUserSchema(BaseModel):
+    id: int = Field(..., description="ID do usuário")
+    nome: Optional[str] = Field(None, description="Nome do usuário")
+    email: Optional[str] = Field(None, description="Email do usuário")
+    ativo: Optional[bool] = Field(None, description="Indica se o usuário está ativo")
+    admin: Optional[bool] = Field(None, description="Indica se o usuário tem privilégios de administrador")
+    versao_token: int = Field(0, description="Versão dos tokens emitidos para o usuário")
+    
+    class Config:
+        from_attributes = True
+        frozen = True
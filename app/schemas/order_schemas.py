@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
+from typing import Generic, Literal, Optional, TypeVar
+
+
+T = TypeVar("T")
 
 
 class OrderSchema(BaseModel):
@@ -37,3 +40,50 @@ class ResponseOrderShema(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# respostas sem as restrições de entrada do ItemOrderSchema: o que está no banco sempre serializa
+class OrderItemResponse(BaseModel):
+    id: int = Field(..., description="ID do item")
+    quantidade: int = Field(..., description="Quantidade do item no pedido")
+    sabor: str = Field(..., description="Sabor do item no pedido")
+    tamanho: str = Field(..., description="Tamanho do item no pedido")
+    preco_unitario: float = Field(..., description="Preço unitário do item no pedido")
+    pedido: int = Field(..., description="ID do pedido")
+
+    class Config:
+        from_attributes = True
+
+
+class OrderSummaryResponse(OrderResponse):
+    item_count: int = Field(..., description="Quantidade de itens do pedido")
+    versao: int = Field(..., description="Versão do pedido (muda a cada alteração)")
+
+
+class OrderDetailResponse(OrderSummaryResponse):
+    itens: list[OrderItemResponse] = Field(default_factory=list, description="Itens do pedido")
+
+
+class GetOrderResponse(BaseModel):
+    quantity: int = Field(..., description="Quantidade de itens do pedido")
+    order: OrderDetailResponse
+
+
+class FinishOrderResponse(BaseModel):
+    message: str
+    order: OrderSummaryResponse
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: list[T] = Field(..., description="Itens da página")
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco da próxima página (null na última)")
+
+
+class OrderImportSchema(OrderSchema):
+    status: Literal['PENDENTE', 'CANCELADO', 'FINALIZADO'] = Field('PENDENTE', description="Status do pedido")
+    itens: list[ItemOrderSchema] = Field(default_factory=list, description="Itens do pedido")
+
+
+class OrderStatusBatchSchema(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=10000, description="IDs dos pedidos")
+    status: Literal['CANCELADO', 'FINALIZADO'] = Field(..., description="Novo status (só pedidos PENDENTE mudam)")
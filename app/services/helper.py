@@ -1,13 +1,17 @@
 from typing import cast
-from app.db.models import Pedido, Usuario
+from app.db.models import Pedido
+from app.schemas.auth_schemas import AuthenticatedUserSchema
 
 class AuthorizationService:
 
-    def is_owner(self, user: Usuario, order: Pedido) -> bool:
+    def is_owner(self, user: AuthenticatedUserSchema, order: Pedido) -> bool:
         return cast(bool, user.id == order.id_usuario)
     
-    def is_admin(self, user: Usuario) -> bool:
+    def is_admin(self, user: AuthenticatedUserSchema) -> bool:
         return cast(bool, user.admin == True)
     
-    def can_access_order(self, user: Usuario, order: Pedido) -> bool:
+    def can_access_order(self, user: AuthenticatedUserSchema, order: Pedido) -> bool:
         return self.is_owner(user, order) or self.is_admin(user)
+    
+    def can_access_owner(self, user: AuthenticatedUserSchema, owner_id: int) -> bool:
+        return user.id == owner_id or self.is_admin(user)
@@ -0,0 +1,130 @@
+import orjson
+import logging
+import threading
+from typing import Optional
+from app.config import ORDER_CACHE_BACKEND, ORDER_CACHE_TTL, ORDER_CACHE_SIZE, REDIS_URL
+from app.services.cache import TTLCache
+
+
+logger = logging.getLogger("my_app")
+
+
+class MemoryOrderCache:
+    """Cache de pedidos no próprio processo (LRU com TTL).
+
+    Cada worker tem o seu: a invalidação só alcança o processo que fez a
+    escrita, os demais dependem do TTL. Com vários workers use o Redis.
+    """
+
+    backend = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, order_id: int) -> Optional[dict]:
+        return self._cache.get(order_id)
+
+    async def set(self, order_id: int, order: dict):
+        self._cache.set(order_id, order)
+
+    async def invalidate(self, order_id: int):
+        self._cache.invalidate(order_id)
+
+    async def invalidate_many(self, order_ids):
+        for order_id in order_ids:
+            self._cache.invalidate(order_id)
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, **self._cache.stats()}
+
+
+class RedisOrderCache:
+    """Cache de pedidos compartilhado entre workers via Redis.
+
+    Falhas do Redis nunca derrubam a requisição: a leitura vira miss e
+    segue para o banco, e o erro é contado em ``errors``.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, ttl: float, prefix: str = "order:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _key(self, order_id: int) -> str:
+        return f"{self.prefix}{order_id}"
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def get(self, order_id: int) -> Optional[dict]:
+        try:
+            raw = await self.client.get(self._key(order_id))
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Order cache | redis GET failed | {e}")
+            raw = None
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return orjson.loads(raw)
+
+    async def set(self, order_id: int, order: dict):
+        if self.ttl <= 0:
+            return
+        try:
+            await self.client.set(self._key(order_id), orjson.dumps(order), px=int(self.ttl * 1000))
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Order cache | redis SET failed | {e}")
+
+    async def invalidate(self, order_id: int):
+        try:
+            await self.client.delete(self._key(order_id))
+        except Exception as e:
+            # a entrada antiga expira pelo TTL
+            self._count("errors")
+            logger.error(f"Order cache | redis DELETE failed for order {order_id} | {e}")
+
+    async def invalidate_many(self, order_ids):
+        keys = [self._key(order_id) for order_id in order_ids]
+        if not keys:
+            return
+        try:
+            await self.client.delete(*keys)
+        except Exception as e:
+            self._count("errors")
+            logger.error(f"Order cache | redis DELETE failed for {len(keys)} orders | {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def build_order_cache(backend: str = ORDER_CACHE_BACKEND):
+    if backend == "redis":
+        import redis.asyncio as redis
+        return RedisOrderCache(redis.from_url(REDIS_URL), ttl=ORDER_CACHE_TTL)
+    if backend == "memory":
+        return MemoryOrderCache(maxsize=ORDER_CACHE_SIZE, ttl=ORDER_CACHE_TTL)
+    if backend == "none":
+        return MemoryOrderCache(maxsize=0, ttl=0)
+    raise ValueError(f"Invalid ORDER_CACHE_BACKEND: {backend}")
+
+
+order_cache = build_order_cache()
@@ -0,0 +1,111 @@
+import csv
+import io
+import logging
+from collections import defaultdict
+import orjson
+from sqlalchemy import select
+from app.db.models import Pedido, ItensPedido
+
+
+logger = logging.getLogger("my_app")
+
+ORDER_COLUMNS = ["id", "status", "id_usuario", "preco", "item_count"]
+ITEM_COLUMNS = ["item_id", "quantidade", "sabor", "tamanho", "preco_unitario"]
+
+
+class OrderExportService:
+    """Exporta pedidos em NDJSON ou CSV sem materializar a tabela.
+
+    Os pedidos são lidos por cursor do lado do servidor em partições de
+    ``chunk_size`` linhas; os itens de cada partição vêm de uma consulta
+    ``IN`` em uma segunda conexão (o MySQL não aceita outra consulta na
+    conexão que está com o cursor aberto). A memória fica limitada a uma
+    partição por vez.
+    """
+
+    def __init__(self, engine, status=None, id_from=None, id_to=None, include_items=False, chunk_size=1000):
+        self.engine = engine
+        self.status = status
+        self.id_from = id_from
+        self.id_to = id_to
+        self.include_items = include_items
+        self.chunk_size = chunk_size
+
+    def _orders_query(self):
+        query = select(
+            Pedido.id, Pedido.status, Pedido.id_usuario.label("id_usuario"), Pedido.preco, Pedido.item_count
+        ).order_by(Pedido.id)
+        if self.status:
+            query = query.where(Pedido.status == self.status)
+        if self.id_from is not None:
+            query = query.where(Pedido.id >= self.id_from)
+        if self.id_to is not None:
+            query = query.where(Pedido.id <= self.id_to)
+        return query.execution_options(yield_per=self.chunk_size)
+
+    async def _items_by_order(self, connection, order_ids):
+        result = await connection.execute(
+            select(
+                ItensPedido.pedido, ItensPedido.id, ItensPedido.quantidade,
+                ItensPedido.sabor, ItensPedido.tamanho, ItensPedido.preco_unitario
+            ).where(ItensPedido.pedido.in_(order_ids)).order_by(ItensPedido.id)
+        )
+        items = defaultdict(list)
+        for row in result:
+            items[row.pedido].append({
+                "item_id": row.id,
+                "quantidade": row.quantidade,
+                "sabor": row.sabor,
+                "tamanho": row.tamanho,
+                "preco_unitario": row.preco_unitario,
+            })
+        return items
+
+    async def _partitions(self):
+        async with self.engine.connect() as connection, self.engine.connect() as items_connection:
+            result = await connection.stream(self._orders_query())
+            # chaves str puras (as do RowMapping são quoted_name, que o orjson recusa); o select segue ORDER_COLUMNS
+            async for partition in result.partitions():
+                orders = [dict(zip(ORDER_COLUMNS, row)) for row in partition]
+                items = (
+                    await self._items_by_order(items_connection, [order["id"] for order in orders])
+                    if self.include_items else {}
+                )
+                yield orders, items
+
+    async def ndjson(self):
+        async for orders, items in self._partitions():
+            lines = []
+            for order in orders:
+                if self.include_items:
+                    order["itens"] = items.get(order["id"], [])
+                lines.append(orjson.dumps(order))
+            yield b"\n".join(lines) + b"\n"
+
+    async def csv(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(ORDER_COLUMNS + (ITEM_COLUMNS if self.include_items else []))
+        async for orders, items in self._partitions():
+            for order in orders:
+                values = [order[column] for column in ORDER_COLUMNS]
+                if not self.include_items:
+                    writer.writerow(values)
+                    continue
+                # uma linha por item; pedidos sem itens saem com as colunas de item vazias
+                for item in items.get(order["id"]) or [dict.fromkeys(ITEM_COLUMNS)]:
+                    writer.writerow(values + [item[column] for column in ITEM_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    async def stream(self, export_format):
+        try:
+            async for chunk in (self.csv() if export_format == "csv" else self.ndjson()):
+                yield chunk
+        except Exception as e:
+            # o status 200 já foi enviado; registra e encerra o corpo
+            logger.error(f"GET export_orders | stream aborted | {e}")
+            raise
@@ -0,0 +1,142 @@
+import logging
+from pydantic import ValidationError
+from sqlalchemy import insert, select, text
+from app.db.models import Pedido, ItensPedido
+from app.schemas.order_schemas import OrderImportSchema
+
+
+logger = logging.getLogger("my_app")
+
+# linhas de itens por INSERT multi-linha (fica abaixo do limite de parâmetros do SQLite)
+ITEM_ROWS_PER_INSERT = 1000
+# linhas de pedidos por INSERT multi-linha (5 parâmetros cada, abaixo do limite do SQLite)
+ORDER_ROWS_PER_INSERT = 5000
+
+
+class OrderImportService:
+    """Importa pedidos (com itens) a partir de linhas NDJSON, em lotes.
+
+    Cada linha é validada com ``OrderImportSchema``; linhas inválidas são
+    contadas e reportadas sem interromper a importação. Só o lote corrente
+    e no máximo ``max_errors`` erros ficam em memória, então o consumo não
+    depende do tamanho do arquivo.
+    """
+
+    def __init__(self, session, batch_size: int = 500, max_errors: int = 100, on_progress=None):
+        self.session = session
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.on_progress = on_progress
+        self.lines = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        self._batch: list[tuple[int, OrderImportSchema]] = []
+        self._id_step = None
+
+    def _record_error(self, line_number: int, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "errors": errors})
+
+    async def add_line(self, line):
+        self.lines += 1
+        if not line.strip():
+            return
+        try:
+            order = OrderImportSchema.model_validate_json(line)
+        except ValidationError as e:
+            self._record_error(self.lines, e.errors(include_url=False, include_context=False, include_input=False))
+            return
+        self._batch.append((self.lines, order))
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def _insert_orders(self, orders: list[OrderImportSchema]) -> list[int]:
+        rows = [
+            {
+                "usuario": order.id_usuario,
+                "status": order.status,
+                "preco": sum(item.preco_unitario * item.quantidade for item in order.itens),
+                "item_count": len(order.itens),
+            }
+            for order in orders
+        ]
+        ids = []
+        for start in range(0, len(rows), ORDER_ROWS_PER_INSERT):
+            ids.extend(await self._insert_order_rows(rows[start:start + ORDER_ROWS_PER_INSERT]))
+        return ids
+
+    async def _insert_order_rows(self, rows: list[dict]) -> list[int]:
+        # um INSERT multi-linha por bloco: os ids gerados por um mesmo INSERT crescem na ordem
+        # das linhas, então os ids em ordem crescente correspondem às linhas na ordem enviada
+        table = Pedido.__table__
+        query = insert(table).values(rows)
+        if self.session.bind.dialect.insert_returning:
+            inserted = sorted((await self.session.execute(query.returning(table.c.id, table.c.usuario))).all())
+        else:
+            # sem RETURNING (MySQL): o InnoDB reserva os ids de um INSERT de tamanho conhecido
+            # de uma vez, a partir do LAST_INSERT_ID(); uma única leitura traz as linhas de volta
+            if self._id_step is None:
+                self._id_step = await self.session.scalar(text("SELECT @@auto_increment_increment"))
+            first_id = (await self.session.execute(query)).lastrowid
+            ids = range(first_id, first_id + len(rows) * self._id_step, self._id_step)
+            inserted = (await self.session.execute(
+                select(table.c.id, table.c.usuario).where(table.c.id.in_(ids)).order_by(table.c.id)
+            )).all()
+        # se a correspondência não se confirmar, o lote é desfeito e reportado como erro
+        if [row.usuario for row in inserted] != [row["usuario"] for row in rows]:
+            raise RuntimeError(f"Inserted order ids do not match the batch ({len(inserted)}/{len(rows)} rows)")
+        return [row.id for row in inserted]
+
+    async def flush(self):
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        try:
+            order_ids = await self._insert_orders([order for _, order in batch])
+            item_rows = [
+                {**item.model_dump(), "pedido": order_id}
+                for order_id, (_, order) in zip(order_ids, batch)
+                for item in order.itens
+            ]
+            for start in range(0, len(item_rows), ITEM_ROWS_PER_INSERT):
+                await self.session.execute(
+                    insert(ItensPedido.__table__).values(item_rows[start:start + ITEM_ROWS_PER_INSERT])
+                )
+            await self.session.commit()
+            self.imported += len(batch)
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Order import | batch ending at line {batch[-1][0]} failed | {e}")
+            for line_number, _ in batch:
+                self._record_error(line_number, [{"type": "database_error", "msg": str(e.__class__.__name__)}])
+        if self.on_progress:
+            self.on_progress(self.report())
+
+    async def import_lines(self, lines):
+        async for line in lines:
+            await self.add_line(line)
+        await self.flush()
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            "lines": self.lines,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def iter_ndjson_lines(chunks):
+    # junta os pedaços de bytes do corpo e devolve uma linha por vez
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
@@ -1,17 +1,196 @@
+import base64
+import binascii
+import hashlib
 from fastapi import HTTPException
-from app.db.models import Pedido
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import selectinload
+from app.db.models import Pedido, ItensPedido
+from app.services.helper import AuthorizationService
+from app.services.metrics import order_update_conflicts_total
+from app.services.order_cache import order_cache
+
+
+# status de destino -> status de origem a partir dos quais a transição é permitida
+STATUS_TRANSITIONS = {
+    "CANCELADO": ("PENDENTE",),
+    "FINALIZADO": ("PENDENTE",),
+}
+# rótulo "operation" de order_update_conflicts_total
+TRANSITION_OPERATIONS = {"CANCELADO": "cancel", "FINALIZADO": "finish"}
+
+ORDER_COLUMNS = (Pedido.id, Pedido.status, Pedido.id_usuario, Pedido.preco, Pedido.item_count, Pedido.versao)
+ITEM_COLUMNS = (
+    ItensPedido.id, ItensPedido.quantidade, ItensPedido.sabor,
+    ItensPedido.tamanho, ItensPedido.preco_unitario, ItensPedido.pedido
+)
+# nomes dos atributos (Pedido.id_usuario é a coluna "usuario")
+ORDER_FIELDS = tuple(column.key for column in ORDER_COLUMNS)
+ITEM_FIELDS = tuple(column.key for column in ITEM_COLUMNS)
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def order_etag(order_id: int, versao: int) -> str:
+    return f'"{order_id}-{versao}"'
+
+
+def page_etag(versions, has_more: bool) -> str:
+    # (id, versao) de cada pedido da página: muda com alteração, entrada ou saída de qualquer um deles
+    digest = hashlib.sha1(repr((list(versions), has_more)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # comparação fraca (RFC 9110): ignora o prefixo W/
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
 
 class OrderService:
-        
-    def get_order(self, status, session):
+    
+    def _window(self, query, limit, cursor):
+        # keyset em Pedido.id: limit + 1 linhas para saber se há próxima página
+        if cursor:
+            query = query.filter(Pedido.id > decode_cursor(cursor))
+        return query.order_by(Pedido.id).limit(limit + 1)
+    
+    async def _paginate(self, query, limit, cursor, session):
+        rows = (await session.scalars(self._window(query, limit, cursor))).all()
+        next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+        etag = page_etag(((row.id, row.versao) for row in rows[:limit]), len(rows) > limit)
+        return rows[:limit], next_cursor, etag
+    
+    async def _page_etag(self, query, limit, cursor, session):
+        # mesma janela da página, só com (id, versao): responde 304 sem carregar os pedidos
+        rows = (await session.execute(
+            self._window(query, limit, cursor).with_only_columns(Pedido.id, Pedido.versao)
+        )).all()
+        return page_etag((tuple(row) for row in rows[:limit]), len(rows) > limit)
+    
+    def _orders_query(self, status):
+        query = select(Pedido)
         if status:
-            all_orders = session.query(Pedido).filter_by(status=status).all()
-        else:
-            all_orders = session.query(Pedido).all()
-        return all_orders
+            query = query.filter_by(status=status)
+        return query
+    
+    async def get_order(self, status, session, limit, cursor=None):
+        return await self._paginate(self._orders_query(status), limit, cursor, session)
+    
+    async def get_order_etag(self, status, session, limit, cursor=None):
+        return await self._page_etag(self._orders_query(status), limit, cursor, session)
+    
+    async def list_orders(self, user, session, limit, cursor=None):
+        query = select(Pedido).filter_by(id_usuario=user.id).options(selectinload(Pedido.itens))
+        return await self._paginate(query, limit, cursor, session)
     
-    def get_order_by_id(self, order_id, session):
-        order = session.query(Pedido).filter_by(id=order_id).first()
+    async def list_orders_etag(self, user, session, limit, cursor=None):
+        query = select(Pedido).filter_by(id_usuario=user.id)
+        return await self._page_etag(query, limit, cursor, session)
+    
+    async def apply_item_delta(self, order_id, delta_preco, delta_count, session):
+        # UPDATE atômico: o banco soma o delta, sem recarregar os itens nem sobrescrever escritas concorrentes
+        query = (
+            update(Pedido)
+            .where(Pedido.id == order_id)
+            .values(
+                preco=func.coalesce(Pedido.preco, 0) + delta_preco,
+                item_count=Pedido.item_count + delta_count,
+                versao=Pedido.versao + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if session.bind.dialect.update_returning:
+            preco = await session.scalar(query.returning(Pedido.preco))
+            if preco is None:
+                # o pedido sumiu entre a leitura e o UPDATE
+                order_update_conflicts_total.inc("item_delta")
+            return preco
+        result = await session.execute(query)
+        if not result.rowcount:
+            order_update_conflicts_total.inc("item_delta")
+            return None
+        return await session.scalar(select(Pedido.preco).filter_by(id=order_id))
+    
+    async def transition_status(self, order_ids, new_status, session, owner_id=None):
+        # a máquina de estados fica no WHERE: só muda pedidos em um status de origem válido
+        conditions = [Pedido.id.in_(order_ids), Pedido.status.in_(STATUS_TRANSITIONS[new_status])]
+        if owner_id is not None:
+            conditions.append(Pedido.id_usuario == owner_id)
+        query = (
+            update(Pedido)
+            .values(status=new_status, versao=Pedido.versao + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if session.bind.dialect.update_returning:
+            result = await session.execute(query.where(*conditions).returning(*ORDER_COLUMNS))
+            return [dict(row) for row in result.mappings()]
+        # sem RETURNING (MySQL): trava as linhas elegíveis e atualiza exatamente essas
+        ids = (await session.scalars(select(Pedido.id).where(*conditions).with_for_update())).all()
+        if not ids:
+            return []
+        await session.execute(query.where(Pedido.id.in_(ids)))
+        result = await session.execute(select(*ORDER_COLUMNS).where(Pedido.id.in_(ids)))
+        return [dict(row) for row in result.mappings()]
+    
+    async def transition_order(self, order_id, new_status, user, session):
+        owner_id = None if AuthorizationService().is_admin(user) else user.id
+        rows = await self.transition_status([order_id], new_status, session, owner_id)
+        if rows:
+            return rows[0]
+        # nada mudou: só então lê o pedido para dizer o motivo
+        current = (await session.execute(
+            select(Pedido.id_usuario, Pedido.status).filter_by(id=order_id)
+        )).first()
+        if not current:
+            raise HTTPException(status_code=404, detail="Order not found")
+        if not AuthorizationService().can_access_owner(user, current.id_usuario):
+            raise HTTPException(status_code=401, detail="Not authorized to change this order.")
+        # o pedido existe e é de quem pediu, mas já saiu de PENDENTE (outra requisição chegou antes)
+        order_update_conflicts_total.inc(TRANSITION_OPERATIONS[new_status])
+        raise HTTPException(
+            status_code=409,
+            detail=f"Order {order_id} is {current.status}; cannot change it to {new_status}."
+        )
+    
+    async def add_items(self, order_id, items, session):
+        # um único INSERT multi-linha e um único UPDATE do total
+        await session.execute(
+            insert(ItensPedido).values([
+                {**item.model_dump(), "pedido": order_id} for item in items
+            ])
+        )
+        return await self.apply_item_delta(
+            order_id, sum(item.preco_unitario * item.quantidade for item in items), len(items), session
+        )
+    
+    async def load_order(self, order_id, session) -> dict:
+        # só colunas, sem entidades na sessão: serializar não dispara lazy load nem lê estado do ORM
+        order = (await session.execute(select(*ORDER_COLUMNS).filter_by(id=order_id))).first()
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
+        items = await session.execute(select(*ITEM_COLUMNS).filter_by(pedido=order_id).order_by(ItensPedido.id))
+        return {
+            **dict(zip(ORDER_FIELDS, order)),
+            "itens": [dict(zip(ITEM_FIELDS, item)) for item in items],
+        }
+    
+    async def get_cached_order(self, order_id, session) -> dict:
+        # read-through: a autorização fica com quem chama, em todo acerto
+        cached = await order_cache.get(order_id)
+        if cached is not None:
+            return cached
+        order = await self.load_order(order_id, session)
+        await order_cache.set(order_id, order)
         return order
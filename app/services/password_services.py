@@ -0,0 +1,56 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from app.services.request_context import timed
+
+
+class PasswordQueueFull(Exception):
+    pass
+
+
+class PasswordService:
+    """Executa hash/verificação de senhas fora do event loop.
+
+    O bcrypt libera o GIL, então um pool pequeno de threads basta para tirar
+    o custo de CPU do loop. Pedidos acima de ``max_workers + max_queue``
+    são recusados com ``PasswordQueueFull`` em vez de acumular sem limite.
+    Com ``max_workers=0`` o trabalho roda direto no loop (sem pool).
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_queue: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+            if max_workers > 0 else None
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.pending - self.max_workers, 0)
+
+    async def _run(self, func, *args):
+        if self._executor is None:
+            with timed("bcrypt"):
+                return func(*args)
+        if self.pending >= self.max_pending:
+            raise PasswordQueueFull("Password hashing queue is full")
+        self.pending += 1
+        try:
+            # inclui a espera na fila do pool: é o que a requisição de fato aguarda
+            with timed("bcrypt"):
+                return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, senha: str) -> str:
+        return await self._run(self.context.hash, senha)
+
+    async def verify(self, senha: str, senha_hash: str) -> bool:
+        return await self._run(self.context.verify, senha, senha_hash)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+
+
+@dataclass
+class RequestContext:
+    """Estado da requisição em andamento: id e tempo gasto por componente (segundos)."""
+
+    request_id: str
+    timings: dict = field(default_factory=dict)
+    scope: Optional[dict] = field(default=None, repr=False)
+
+    def add_time(self, component: str, seconds: float):
+        self.timings[component] = self.timings.get(component, 0.0) + seconds
+
+    @property
+    def route(self) -> str:
+        # "MÉTODO /template/{param}"; o template só existe depois do roteamento
+        if self.scope is None:
+            return "-"
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else '<unmatched>'}"
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current_request.get()
+
+
+def set_current_request(context: Optional[RequestContext]):
+    return _current_request.set(context)
+
+
+def reset_current_request(token):
+    _current_request.reset(token)
+
+
+@contextmanager
+def timed(component: str):
+    # fora de uma requisição (comandos, scripts) não mede nada
+    context = _current_request.get()
+    if context is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        context.add_time(component, perf_counter() - start)
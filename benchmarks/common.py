@@ -0,0 +1,46 @@
+import logging
+import os
+import statistics
+import sys
+import tempfile
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summary(name, values):
+    return (
+        f"{name:<8} n={len(values):<5} p50={percentile(values, 50) * 1000:8.1f} ms "
+        f"p95={percentile(values, 95) * 1000:8.1f} ms max={max(values) * 1000:8.1f} ms "
+        f"mean={statistics.mean(values) * 1000:8.1f} ms"
+    )
+
+
+def latency_stats(values, elapsed) -> dict:
+    return {
+        "n": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3),
+        "throughput_rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def configure_environment(database_url=None, **overrides) -> str:
+    """Aponta a aplicação para um SQLite temporário (ou ``database_url``); chamar antes de importar ``app``."""
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ["DATABASE_URL"] = database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_FILE"] = os.path.join(workdir, "app.log")
+    os.environ.update({key: str(value) for key, value in overrides.items()})
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return workdir
+
+
+def quiet_logging():
+    for name in ("my_app", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
@@ -0,0 +1,82 @@
+"""Latência de login e de GET /orders/order sob carga mista.
+
+Roda a aplicação em processo (httpx + ASGITransport) contra um SQLite
+temporário, dispara logins e leituras de pedidos concorrentes e imprime
+p50/p95/max de cada tipo de requisição. Compare o pool de bcrypt com o
+modo inline (hash no event loop):
+
+    python -m benchmarks.login_mixed_load --workers 4
+    python -m benchmarks.login_mixed_load --workers 0
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.common import configure_environment, quiet_logging, summary
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy.orm import Session
+    from app.main import app, bcrypt_context
+    from app.db.connection import db, async_db
+    from app.db.models import Base, Usuario, Pedido
+
+    quiet_logging()
+
+    Base.metadata.create_all(db)
+    with Session(db) as session:
+        senha = bcrypt_context.hash("benchmark")
+        session.add_all(Usuario(f"user{i}", f"user{i}@bench.local", senha, True, i == 0) for i in range(args.users))
+        session.flush()
+        session.add_all(Pedido(usuario=1 + i % args.users) for i in range(200))
+        session.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/auth/login", json={"email": "user0@bench.local", "senha": "benchmark"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        latencies = {"login": [], "orders": []}
+        deadline = time.perf_counter() + args.duration
+
+        async def login_loop(i):
+            payload = {"email": f"user{i % args.users}@bench.local", "senha": "benchmark"}
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.post("/auth/login", json=payload)
+                latencies["login"].append(time.perf_counter() - start)
+
+        async def orders_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/orders/order", headers=headers)
+                latencies["orders"].append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(
+            *(login_loop(i) for i in range(args.logins)),
+            *(orders_loop() for _ in range(args.readers)),
+        )
+
+    await async_db.dispose()
+    print(f"bcrypt workers={args.workers} logins={args.logins} readers={args.readers} duration={args.duration}s")
+    for name, values in latencies.items():
+        if values:
+            print(summary(name, values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="BCRYPT_MAX_WORKERS (0 = inline no event loop)")
+    parser.add_argument("--logins", type=int, default=8, help="logins concorrentes")
+    parser.add_argument("--readers", type=int, default=8, help="leitores concorrentes de /orders/order")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    configure_environment(BCRYPT_MAX_WORKERS=args.workers, BCRYPT_MAX_QUEUE=max(args.logins, 1) * 2)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
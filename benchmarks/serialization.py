@@ -0,0 +1,93 @@
+"""Tempo de serialização de respostas com 10 mil pedidos.
+
+Compara, para ``CursorPage[OrderResponse]`` (listagem geral) e
+``CursorPage[ResponseOrderShema]`` (pedidos do usuário, com itens):
+
+- ``encoder``: ``jsonable_encoder`` + ``JSONResponse`` (rotas sem response_model);
+- ``json``: dump do modelo para Python + ``JSONResponse``, o caminho do
+  FastAPI fixado (0.119) com a classe de resposta padrão do FastAPI;
+- ``orjson``: o mesmo dump + ``app.responses.ORJSONResponse``, a
+  ``default_response_class`` da aplicação;
+- ``pydantic``: ``dump_json`` do Pydantic (referência: é o que versões mais
+  novas do FastAPI fazem sem classe de resposta customizada);
+
+e as linhas NDJSON da exportação com ``json`` e com orjson:
+
+    python -m benchmarks.serialization --orders 10000 --items 5
+"""
+import argparse
+import json
+import time
+from benchmarks.common import configure_environment, summary
+
+
+def build_page(orders, items_per_order):
+    item = {"quantidade": 1, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 35.5}
+    return {
+        "items": [
+            {
+                "id": order_id, "status": "PENDENTE", "id_usuario": order_id % 100, "preco": 35.5 * items_per_order,
+                "itens": [dict(item) for _ in range(items_per_order)],
+            }
+            for order_id in range(1, orders + 1)
+        ],
+        "next_cursor": "MTAwMDA",
+    }
+
+
+def timed(repeat, function):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = function()
+        latencies.append(time.perf_counter() - start)
+    return latencies, len(body)
+
+
+def run(args):
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from starlette.responses import JSONResponse
+    from app.responses import ORJSONResponse
+    from app.schemas.order_schemas import CursorPage, OrderResponse, ResponseOrderShema
+
+    page = build_page(args.orders, args.items)
+    for model in (OrderResponse, ResponseOrderShema):
+        adapter = TypeAdapter(CursorPage[model])
+        value = adapter.validate_python(page)
+        print(f"CursorPage[{model.__name__}] ({args.orders} pedidos)")
+        paths = {
+            "encoder": lambda: JSONResponse(jsonable_encoder(value)).body,
+            "json": lambda: JSONResponse(adapter.dump_python(value, mode="json")).body,
+            "orjson": lambda: ORJSONResponse(adapter.dump_python(value, mode="json")).body,
+            "pydantic": lambda: adapter.dump_json(value),
+        }
+        for name, function in paths.items():
+            latencies, size = timed(args.repeat, function)
+            print(f"  {summary(name, latencies)} ({size / 1024:.0f} KiB)")
+
+    print(f"NDJSON da exportação ({args.orders} pedidos com itens)")
+    orders = page["items"]
+    lines = {
+        "json": lambda: "\n".join(json.dumps(order, ensure_ascii=False) for order in orders).encode(),
+        "orjson": lambda: b"\n".join(orjson.dumps(order) for order in orders),
+    }
+    for name, function in lines.items():
+        latencies, size = timed(args.repeat, function)
+        print(f"  {summary(name, latencies)} ({size / 1024:.0f} KiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=5, help="itens por pedido")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    configure_environment()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
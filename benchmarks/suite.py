@@ -0,0 +1,220 @@
+"""Suíte de benchmarks dos endpoints de autenticação e pedidos.
+
+Roda a aplicação em processo (httpx + ASGITransport) contra um banco
+populado (SQLite temporário por padrão, ou ``--database-url`` vazio e
+compatível com MySQL). Para cada tamanho de dados (número de pedidos)
+mede p50/p95/p99 e vazão de login, refresh, criação de pedido, inclusão
+de item, leitura de pedido, listagem de pedidos e GET /auth/users:
+
+    python -m benchmarks.suite --sizes 1000,10000,100000 --output resultados.json
+    python -m benchmarks.suite --save-baseline /tmp/baseline.json
+    python -m benchmarks.suite --baseline /tmp/baseline.json
+
+Com ``--baseline`` cada cenário é comparado ao arquivo salvo e o processo
+sai com código 1 se algum p95 subir (ou a vazão cair) mais que
+``--tolerance``. Os números dependem da máquina: o baseline é gravado
+na mesma máquina, a partir do commit de referência, antes de medir a
+mudança (não há baseline versionado nem job de CI).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from benchmarks.common import configure_environment, latency_stats, quiet_logging
+
+
+PASSWORD = "benchmark"
+USERS_PER_ORDER = 0.1
+# diferenças abaixo disso são ruído de medição, não regressão
+NOISE_FLOOR_MS = 1.0
+
+
+def seed(db, orders_target, state, rng, senha_hash):
+    """Completa o banco até ``orders_target`` pedidos (e usuários proporcionais) com o app.commands.seed_data."""
+    from sqlalchemy import func, select
+    from app.commands.seed_data import seed_users, seed_orders
+    from app.db.models import Pedido
+
+    users_target = max(int(orders_target * USERS_PER_ORDER), 10)
+    # o primeiro usuário criado (id 1) é o admin dos cenários
+    seed_users(
+        db, users_target - state["users"], senha_hash, admins=int(state["users"] == 0), email_domain="bench.local")
+    state["users"] = max(state["users"], users_target)
+    seed_orders(db, orders_target - state["orders"], rng)
+    state["orders"] = max(state["orders"], orders_target)
+    # pedidos criados pelos próprios cenários também ocupam ids
+    with db.connect() as connection:
+        state["max_order_id"] = connection.scalar(select(func.max(Pedido.id)))
+
+
+async def measure(iterations, concurrency, request):
+    latencies, errors = [], 0
+    indexes = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for index in indexes:
+            start = time.perf_counter()
+            response = await request(index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    stats = latency_stats(latencies, time.perf_counter() - start)
+    stats["errors"] = errors
+    return stats
+
+
+async def run_size(client, size, state, args, rng):
+    from app.services.order_services import encode_cursor
+
+    async def login(email):
+        response = await client.post("/auth/login", json={"email": email, "senha": PASSWORD})
+        return response.json()
+
+    admin = await login("user1@bench.local")
+    member = await login(f"user{state['users']}@bench.local")
+    admin_headers = {"Authorization": f"Bearer {admin['access_token']}"}
+    member_headers = {"Authorization": f"Bearer {member['access_token']}"}
+    member_id = state["users"]
+    created = []
+    item = {"quantidade": 1, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 35.5}
+
+    async def create_order(index):
+        response = await client.post("/orders/order", headers=member_headers, json={"id_usuario": member_id})
+        created.append(int(response.json()["message"].rsplit(":", 1)[1]))
+        return response
+
+    scenarios = {
+        "login": (args.login_iterations, lambda i: client.post(
+            "/auth/login", json={"email": f"user{rng.randint(1, state['users'])}@bench.local", "senha": PASSWORD})),
+        "refresh": (args.iterations, lambda i: client.get(
+            "/auth/refresh", headers={"Authorization": f"Bearer {member['refresh_token']}"})),
+        "create_order": (args.iterations, create_order),
+        "add_item": (args.iterations, lambda i: client.post(
+            f"/orders/order/add_item/{created[i % len(created)]}", headers=member_headers, json=item)),
+        "get_order": (args.iterations, lambda i: client.get(
+            f"/orders/order/{rng.randint(1, state['max_order_id'])}", headers=admin_headers)),
+        "list_orders": (args.iterations, lambda i: client.get(
+            "/orders/order", headers=admin_headers,
+            params={"limit": 50, "cursor": encode_cursor(rng.randint(0, max(state["max_order_id"] - 50, 0)))})),
+        "users": (args.iterations, lambda i: client.get(
+            "/auth/users", headers=admin_headers,
+            params={"page": rng.randint(1, max(state["users"] // 50, 1)), "size": 50})),
+    }
+    results = {}
+    for name, (iterations, request) in scenarios.items():
+        results[name] = await measure(iterations, args.concurrency, request)
+        stats = results[name]
+        print(
+            f"{size:>9} {name:<13} n={stats['n']:<5} p50={stats['p50_ms']:8.2f} p95={stats['p95_ms']:8.2f} "
+            f"p99={stats['p99_ms']:8.2f} ms {stats['throughput_rps']:8.1f} req/s errors={stats['errors']}"
+        )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, scenarios in results.items():
+        for name, current in scenarios.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if previous is None:
+                continue
+            p95_limit = previous["p95_ms"] * (1 + tolerance)
+            if current["p95_ms"] > p95_limit and current["p95_ms"] - previous["p95_ms"] > NOISE_FLOOR_MS:
+                regressions.append(f"{size} {name}: p95 {previous['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+            if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{size} {name}: throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s"
+                )
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+async def run(args):
+    import httpx
+    from app.main import app, bcrypt_context
+    from app.db.connection import db, async_db
+    from app.db.models import Base
+
+    quiet_logging()
+    Base.metadata.create_all(db)
+
+    rng = random.Random(args.seed)
+    senha_hash = bcrypt_context.hash(PASSWORD)
+    state = {"users": 0, "orders": 0}
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            seed(db, size, state, rng, senha_hash)
+            print(f"seeded {state['orders']} orders / {state['users']} users in {time.perf_counter() - start:.1f}s")
+            results[str(size)] = await run_size(client, size, state, args, rng)
+    await async_db.dispose()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": db.dialect.name,
+            "concurrency": args.concurrency,
+            "iterations": args.iterations,
+            "login_iterations": args.login_iterations,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"no regressions against {args.baseline}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda raw: [int(size) for size in raw.split(",")], default=[1000, 10000],
+                        help="quantidades de pedidos, separadas por vírgula (dados acumulam em ordem crescente)")
+    parser.add_argument("--iterations", type=int, default=300, help="requisições por cenário")
+    parser.add_argument("--login-iterations", type=int, default=40, help="requisições de login (bcrypt é caro)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="banco vazio a usar no lugar do SQLite temporário")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--save-baseline", help="grava os resultados como baseline")
+    parser.add_argument("--baseline", help="compara com um baseline salvo e sai com 1 em regressão")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="piora relativa aceita antes de acusar regressão")
+    args = parser.parse_args()
+
+    configure_environment(database_url=args.database_url)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
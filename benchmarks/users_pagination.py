@@ -0,0 +1,76 @@
+"""Latência de GET /auth/users sobre uma tabela grande de usuários.
+
+Popula ``usuarios`` com N linhas (padrão 1.000.000) via inserts em lote,
+mede páginas do início, do meio e do fim da listagem e compara com a
+abordagem antiga (carregar todos os usuários e fatiar em Python):
+
+    python -m benchmarks.users_pagination --users 1000000
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.common import configure_environment, quiet_logging, summary
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+    from app.main import app, bcrypt_context
+    from app.db.connection import db, async_db, SessionLocal
+    from app.db.models import Base, Usuario
+    from app.commands.seed_data import seed_users
+
+    quiet_logging()
+
+    Base.metadata.create_all(db)
+    with Session(db) as session:
+        session.add(Usuario("admin", "admin@bench.local", bcrypt_context.hash("benchmark"), True, True))
+        session.commit()
+    start = time.perf_counter()
+    seed_users(db, args.users - 1, "x", email_domain="bench.local")
+    print(f"seeded {args.users} users in {time.perf_counter() - start:.1f}s")
+
+    last_page = max(args.users // args.size, 1)
+    pages = {"first": 1, "middle": max(last_page // 2, 1), "last": last_page}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/auth/login", json={"email": "admin@bench.local", "senha": "benchmark"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for name, page in pages.items():
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                response = await client.get("/auth/users", headers=headers, params={"page": page, "size": args.size})
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+            print(summary(name, latencies) + f" (page {page})")
+
+    if args.legacy:
+        # abordagem anterior: todos os usuários como ORM, paginação em Python
+        async with SessionLocal() as session:
+            start = time.perf_counter()
+            users = (await session.scalars(select(Usuario))).all()
+            items = [{"id": user.id, "nome": user.nome, "email": user.email} for user in users]
+            items[:args.size]
+            print(f"legacy   full load + slice: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    await async_db.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=50, help="tamanho da página")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-legacy", dest="legacy", action="store_false", help="não mede a abordagem antiga")
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+
+# a aplicação lê a configuração ao ser importada: aponta para um SQLite temporário antes
+_workdir = tempfile.mkdtemp(prefix="tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ["LOG_FILE"] = os.path.join(_workdir, "app.log")
+# sem cache de pedidos: toda leitura vai ao banco
+os.environ["ORDER_CACHE_BACKEND"] = "none"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+from sqlalchemy import insert
+from app.db.connection import db
+from app.db.models import Base, Usuario
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def app():
+    from app.main import app
+
+    Base.metadata.create_all(db)
+    # o ASGITransport não dispara o lifespan; o encerramento dele fecha o pool do banco
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(app):
+    """Cria um usuário (comum, ou admin com ``admin=True``) e devolve (id, headers com um access token dele)."""
+    from app.routes.auth_routes import criar_token
+
+    def make_user(nome: str, admin: bool = False):
+        with db.begin() as connection:
+            user_id = connection.execute(insert(Usuario.__table__).values(
+                nome=nome, email=f"{nome}@test.local", senha="-", ativo=True, admin=admin, versao_token=0,
+            )).inserted_primary_key[0]
+        usuario = Usuario(nome, f"{nome}@test.local", "-", True, admin)
+        usuario.id, usuario.versao_token = user_id, 0
+        return user_id, {"Authorization": f"Bearer {criar_token(usuario)}"}
+
+    return make_user
@@ -0,0 +1,50 @@
+"""POST /orders/order/add_items/{order_id}: validação do corpo pelo ItemOrderSchema."""
+import pytest
+from sqlalchemy import insert, select
+from app.db.connection import db
+from app.db.models import Pedido, ItensPedido
+
+
+pytestmark = pytest.mark.anyio
+
+ITEM = {"quantidade": 2, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 25.0}
+
+
+def create_order(user_id: int) -> int:
+    with db.begin() as connection:
+        return connection.execute(insert(Pedido.__table__).values(
+            usuario=user_id, status="PENDENTE", preco=0, item_count=0, versao=1,
+        )).inserted_primary_key[0]
+
+
+async def test_add_items_inserts_all_items(client, make_user):
+    user_id, headers = make_user("add_items")
+    order_id = create_order(user_id)
+
+    response = await client.post(f"/orders/order/add_items/{order_id}", json=[ITEM, ITEM], headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["items_added"] == 2
+    assert response.json()["preco_pedido"] == 100.0
+
+
+async def test_invalid_item_is_reported_by_index_and_nothing_is_inserted(client, make_user):
+    user_id, headers = make_user("add_items_invalid")
+    order_id = create_order(user_id)
+
+    response = await client.post(
+        f"/orders/order/add_items/{order_id}", json=[ITEM, {**ITEM, "preco_unitario": 0}], headers=headers
+    )
+
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", 1, "preco_unitario"]]
+    with db.connect() as connection:
+        assert connection.scalars(select(ItensPedido.id).filter_by(pedido=order_id)).all() == []
+
+
+async def test_schema_is_documented(client):
+    schema = (await client.get("/openapi.json")).json()
+    body = schema["paths"]["/orders/order/add_items/{order_id}"]["post"]["requestBody"]["content"]["application/json"]
+
+    assert body["schema"]["items"] == {"$ref": "#/components/schemas/ItemOrderSchema"}
+    assert (body["schema"]["minItems"], body["schema"]["maxItems"]) == (1, 500)
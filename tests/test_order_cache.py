@@ -0,0 +1,107 @@
+"""RedisOrderCache com um cliente assíncrono falso (nenhum Redis de verdade é necessário)."""
+import pytest
+from app.services.order_cache import RedisOrderCache
+
+
+pytestmark = pytest.mark.anyio
+
+ORDER = {
+    "id": 7, "status": "PENDENTE", "id_usuario": 2, "preco": 71.0, "item_count": 2, "versao": 3,
+    "itens": [
+        {"id": 1, "quantidade": 2, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 35.5, "pedido": 7},
+    ],
+}
+
+
+class FakeRedis:
+    """Subconjunto do ``redis.asyncio.Redis`` usado pelo cache: get, set(px=) e delete(*keys)."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.expirations: dict[str, int] = {}
+        self.deletes: list[tuple] = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        assert isinstance(value, bytes)
+        self.data[key] = value
+        self.expirations[key] = px
+
+    async def delete(self, *keys):
+        self.deletes.append(keys)
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, px=None):
+        raise ConnectionError("redis down")
+
+    async def delete(self, *keys):
+        raise ConnectionError("redis down")
+
+
+async def test_get_miss_then_hit_round_trips_through_orjson():
+    client = FakeRedis()
+    cache = RedisOrderCache(client, ttl=10)
+
+    assert await cache.get(7) is None
+    await cache.set(7, ORDER)
+
+    assert client.data["order:7"].startswith(b"{")
+    assert client.expirations["order:7"] == 10_000
+    assert await cache.get(7) == ORDER
+    assert cache.stats() == {"backend": "redis", "ttl": 10, "hits": 1, "misses": 1, "errors": 0, "hit_ratio": 0.5}
+
+
+async def test_set_is_disabled_without_ttl():
+    client = FakeRedis()
+    cache = RedisOrderCache(client, ttl=0)
+
+    await cache.set(7, ORDER)
+
+    assert client.data == {}
+    assert await cache.get(7) is None
+
+
+async def test_invalidate_removes_a_single_order():
+    client = FakeRedis()
+    cache = RedisOrderCache(client, ttl=10, prefix="test:")
+    await cache.set(7, ORDER)
+    await cache.set(8, ORDER)
+
+    await cache.invalidate(7)
+
+    assert await cache.get(7) is None
+    assert await cache.get(8) == ORDER
+    assert client.deletes == [("test:7",)]
+
+
+async def test_invalidate_many_uses_a_single_delete():
+    client = FakeRedis()
+    cache = RedisOrderCache(client, ttl=10)
+    for order_id in (1, 2, 3):
+        await cache.set(order_id, ORDER)
+
+    await cache.invalidate_many([1, 3])
+    await cache.invalidate_many([])
+
+    assert client.deletes == [("order:1", "order:3")]
+    assert list(client.data) == ["order:2"]
+
+
+async def test_redis_errors_degrade_to_misses():
+    cache = RedisOrderCache(BrokenRedis(), ttl=10)
+
+    await cache.set(7, ORDER)
+    assert await cache.get(7) is None
+    await cache.invalidate(7)
+    await cache.invalidate_many([7, 8])
+
+    stats = cache.stats()
+    assert stats["errors"] == 4
+    assert (stats["hits"], stats["misses"]) == (0, 1)
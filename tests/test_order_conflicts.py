@@ -0,0 +1,38 @@
+"""Transições em disputa: o UPDATE condicional não altera nada e o conflito é contado."""
+import pytest
+from sqlalchemy import insert
+from app.db.connection import db
+from app.db.models import Pedido
+from app.services.metrics import order_update_conflicts_total
+
+
+pytestmark = pytest.mark.anyio
+
+
+def conflicts(operation: str) -> float:
+    return order_update_conflicts_total._values.get((operation,), 0)
+
+
+async def test_second_transition_is_a_counted_conflict(client, make_user):
+    user_id, headers = make_user("conflict")
+    with db.begin() as connection:
+        order_id = connection.execute(insert(Pedido.__table__).values(
+            usuario=user_id, status="PENDENTE", preco=0, item_count=0, versao=1,
+        )).inserted_primary_key[0]
+    before = conflicts("cancel")
+
+    assert (await client.post(f"/orders/order/finish/{order_id}", headers=headers)).status_code == 200
+    response = await client.post(f"/orders/order/cancel/{order_id}", headers=headers)
+
+    assert response.status_code == 409
+    assert conflicts("cancel") == before + 1
+
+
+async def test_missing_order_is_not_a_conflict(client, make_user):
+    _, headers = make_user("conflict_missing", admin=True)
+    before = conflicts("finish")
+
+    response = await client.post("/orders/order/finish/999999", headers=headers)
+
+    assert response.status_code == 404
+    assert conflicts("finish") == before
@@ -0,0 +1,33 @@
+"""Validação dos filtros de GET /orders/order/export."""
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_rejects_unknown_status(client, make_user):
+    _, headers = make_user("export_status", admin=True)
+
+    response = await client.get("/orders/order/export", params={"status": "ENTREGUE"}, headers=headers)
+
+    assert response.status_code == 422
+
+
+async def test_export_rejects_inverted_id_range(client, make_user):
+    _, headers = make_user("export_range", admin=True)
+
+    response = await client.get("/orders/order/export", params={"id_from": 10, "id_to": 5}, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "id_from must be less than or equal to id_to"}
+
+
+async def test_export_accepts_known_status_and_range(client, make_user):
+    _, headers = make_user("export_ok", admin=True)
+
+    response = await client.get(
+        "/orders/order/export", params={"status": "FINALIZADO", "id_from": 5, "id_to": 5}, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
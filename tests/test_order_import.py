@@ -0,0 +1,101 @@
+"""Importação em lotes: um INSERT multi-linha por lote de pedidos, com ou sem RETURNING."""
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.sql.dml import Insert
+from app.db.connection import SessionLocal
+from app.db.models import Pedido
+from app.db.query_counter import count_queries
+from app.services.order_import_services import OrderImportService
+
+
+pytestmark = pytest.mark.anyio
+
+LINES = [
+    b'{"id_usuario": 1, "itens": [{"quantidade": 1, "sabor": "a", "tamanho": "M", "preco_unitario": 10}]}',
+    b'{"id_usuario": 2, "status": "FINALIZADO"}',
+    b'{"id_usuario": 3}',
+]
+
+
+class MySQLLikeSession:
+    """Sessão mínima com a semântica do MySQL: sem RETURNING, ``lastrowid`` é o primeiro id do INSERT."""
+
+    def __init__(self, first_id: int = 100, step: int = 1, skip_id=None):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(insert_returning=False))
+        self.next_id = first_id
+        self.step = step
+        self.skip_id = skip_id
+        self.orders: dict[int, int] = {}
+        self.order_inserts = 0
+        self.items: list[int] = []
+        self.committed = False
+
+    async def scalar(self, statement):
+        return self.step
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            # INSERT ... VALUES (...), (...): parâmetros <coluna>_m<linha>
+            params = statement.compile().params
+            if statement.table is not Pedido.__table__:
+                self.items.extend(value for key, value in params.items() if key.startswith("pedido_m"))
+                return SimpleNamespace()
+            rows = [value for key, value in params.items() if key.startswith("usuario_m")]
+            self.order_inserts += 1
+            first_id = self.next_id
+            for index, usuario in enumerate(rows):
+                order_id = first_id + index * self.step
+                if order_id != self.skip_id:
+                    self.orders[order_id] = usuario
+            self.next_id = first_id + len(rows) * self.step
+            return SimpleNamespace(lastrowid=first_id)
+        rows = [SimpleNamespace(id=order_id, usuario=usuario) for order_id, usuario in sorted(self.orders.items())]
+        return SimpleNamespace(all=lambda: rows)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.committed = False
+
+
+async def import_lines(session):
+    service = OrderImportService(session, batch_size=10)
+    for line in LINES:
+        await service.add_line(line)
+    await service.flush()
+    return service.report()
+
+
+async def test_multirow_insert_without_returning():
+    session = MySQLLikeSession(first_id=100, step=2)
+
+    report = await import_lines(session)
+
+    assert report["imported"] == 3 and report["failed"] == 0
+    assert session.order_inserts == 1
+    assert session.orders == {100: 1, 102: 2, 104: 3}
+    assert session.items == [100]
+    assert session.committed
+
+
+async def test_non_consecutive_ids_fail_the_batch():
+    session = MySQLLikeSession(first_id=100, skip_id=101)
+
+    report = await import_lines(session)
+
+    assert report["imported"] == 0 and report["failed"] == 3
+    assert report["errors"][0]["errors"][0]["type"] == "database_error"
+    assert not session.committed
+
+
+async def test_batch_is_one_insert_per_table(app):
+    async with SessionLocal() as session:
+        service = OrderImportService(session, batch_size=500)
+        with count_queries() as counter:
+            for _ in range(500):
+                await service.add_line(LINES[0])
+            await service.flush()
+
+    assert service.report()["imported"] == 500
+    assert counter.count == 2
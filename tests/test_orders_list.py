@@ -0,0 +1,39 @@
+"""GET /orders/order: listagem de todos os pedidos, só para admins."""
+import pytest
+from sqlalchemy import insert
+from app.db.connection import db
+from app.db.models import Pedido
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_non_admin_is_forbidden(client, make_user):
+    _, headers = make_user("list_member")
+
+    response = await client.get("/orders/order", headers=headers)
+
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Access forbidden: Admins only."}
+
+
+async def test_non_admin_is_forbidden_on_conditional_requests(client, make_user):
+    _, headers = make_user("list_member_etag")
+
+    response = await client.get("/orders/order", headers={**headers, "If-None-Match": '"anything"'})
+
+    assert response.status_code == 403
+
+
+async def test_admin_sees_orders_of_every_user(client, make_user):
+    member_id, _ = make_user("list_owner")
+    _, admin_headers = make_user("list_admin", admin=True)
+    with db.begin() as connection:
+        connection.execute(insert(Pedido.__table__).values(
+            usuario=member_id, status="CANCELADO", preco=0, item_count=0, versao=1,
+        ))
+
+    response = await client.get("/orders/order", params={"status": "CANCELADO", "limit": 500}, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert member_id in {order["id_usuario"] for order in response.json()["items"]}
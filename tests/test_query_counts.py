@@ -0,0 +1,59 @@
+"""Rotas de leitura de pedidos não podem fazer N+1: o número de instruções SQL
+não depende de quantos pedidos/itens o usuário tem."""
+import pytest
+from sqlalchemy import insert
+from app.db.connection import db
+from app.db.models import Pedido, ItensPedido
+from app.db.query_counter import count_queries
+
+
+pytestmark = pytest.mark.anyio
+
+SIZES = (1, 10, 50)
+ITEMS_PER_ORDER = 3
+
+
+def seed_orders(user_id: int, total: int) -> list[int]:
+    with db.begin() as connection:
+        order_ids = [
+            connection.execute(insert(Pedido.__table__).values(
+                usuario=user_id, status="PENDENTE", preco=10.0 * ITEMS_PER_ORDER, item_count=ITEMS_PER_ORDER, versao=1,
+            )).inserted_primary_key[0]
+            for _ in range(total)
+        ]
+        connection.execute(insert(ItensPedido.__table__), [
+            {"quantidade": 1, "sabor": "Calabresa", "tamanho": "Médio", "preco_unitario": 10.0, "pedido": order_id}
+            for order_id in order_ids for _ in range(ITEMS_PER_ORDER)
+        ])
+    return order_ids
+
+
+async def queries_for(client, path: str, headers: dict) -> int:
+    # a primeira chamada aquece o cache do usuário autenticado; conta a segunda
+    assert (await client.get(path, headers=headers)).status_code == 200
+    with count_queries() as counter:
+        response = await client.get(path, headers=headers)
+    assert response.status_code == 200
+    return counter.count
+
+
+async def test_get_order_query_count_is_constant(client, make_user):
+    counts = {}
+    for size in SIZES:
+        user_id, headers = make_user(f"get{size}")
+        order_ids = seed_orders(user_id, size)
+        counts[size] = await queries_for(client, f"/orders/order/{order_ids[-1]}", headers)
+    assert len(set(counts.values())) == 1, counts
+
+
+async def test_list_orders_user_query_count_is_constant(client, make_user):
+    counts = {}
+    for size in SIZES:
+        user_id, headers = make_user(f"list{size}")
+        seed_orders(user_id, size)
+        path = "/orders/order/user/list_orders_user?limit=50"
+        counts[size] = await queries_for(client, path, headers)
+        response = await client.get(path, headers=headers)
+        assert len(response.json()["items"]) == size
+        assert all(len(order["itens"]) == ITEMS_PER_ORDER for order in response.json()["items"])
+    assert len(set(counts.values())) == 1, counts
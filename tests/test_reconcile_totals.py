@@ -0,0 +1,40 @@
+"""reconcile_totals: corrige os totais divergentes e invalida o cache desses pedidos."""
+import anyio
+import pytest
+from sqlalchemy import insert, select
+from app.commands import reconcile_totals
+from app.db.connection import db
+from app.db.models import Pedido, ItensPedido
+
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingCache:
+    def __init__(self):
+        self.invalidated: list[int] = []
+
+    async def invalidate_many(self, order_ids):
+        self.invalidated.extend(order_ids)
+
+
+async def test_reconcile_fixes_totals_and_invalidates_cache(app, make_user, monkeypatch):
+    user_id, _ = make_user("reconcile")
+    with db.begin() as connection:
+        order_id = connection.execute(insert(Pedido.__table__).values(
+            usuario=user_id, status="PENDENTE", preco=1.0, item_count=5, versao=1,
+        )).inserted_primary_key[0]
+        connection.execute(insert(ItensPedido.__table__).values(
+            quantidade=2, sabor="Calabresa", tamanho="Médio", preco_unitario=10.0, pedido=order_id,
+        ))
+    cache = RecordingCache()
+    monkeypatch.setattr(reconcile_totals, "order_cache", cache)
+
+    # o comando é síncrono e usa asyncio.run: roda fora do event loop do teste
+    fixed = await anyio.to_thread.run_sync(reconcile_totals.reconcile)
+
+    assert fixed >= 1 and order_id in cache.invalidated
+    with db.connect() as connection:
+        order = connection.execute(select(Pedido.preco, Pedido.item_count, Pedido.versao).filter_by(id=order_id)).one()
+    assert tuple(order) == (20.0, 1, 2)
+    assert await anyio.to_thread.run_sync(reconcile_totals.reconcile, True) == 0